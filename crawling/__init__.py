@@ -1,4 +1,11 @@
-from .services import kofic, kopis
-from .base import abstract_crawling_service, crawling_interface
+import importlib
 
-__all__ = ["services", "base"]
\ No newline at end of file
+__all__ = ["services", "base"]
+
+# 파싱 worker 프로세스가 crawling.base 일부만 import 할 때 서비스/infra 전체가 로딩되지 않도록 지연 import
+def __getattr__(name):
+    if name in ("services", "base"):
+        return importlib.import_module(f".{name}", __name__)
+    if name in ("kofic", "kopis"):
+        return importlib.import_module(f".services.{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,4 +1,11 @@
-from .abstract_crawling_service import AbstractCrawlingService
-from .crawling_interface import CrawlingInterface
+__all__ = ["AbstractCrawlingService", "CrawlingInterface"]
 
-__all__ = ["AbstractCrawlingService", "CrawlingInterface"]
\ No newline at end of file
+# 파싱 worker 프로세스가 infra(ES 등)까지 import 하지 않도록 지연 import
+def __getattr__(name):
+    if name == "AbstractCrawlingService":
+        from .abstract_crawling_service import AbstractCrawlingService
+        return AbstractCrawlingService
+    if name == "CrawlingInterface":
+        from .crawling_interface import CrawlingInterface
+        return CrawlingInterface
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,9 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import List, Any
+from typing import List, Any, Tuple
+
+from infra.es_utils import CategoryResolver
+from infra.resources import ensure_resources
 
 class AbstractCrawlingService(ABC):
+    # 크롤러 실행에 필요한 캐시 자원 (infra.resources 에 등록된 이름)
+    resources: tuple = ()
+
     def __init__(self, config: dict):
         self.config = config
+        self.categories = CategoryResolver()
+        # 이번 실행에서 상세 페이지를 조회한 목록 항목 (목록 키, fingerprint), 저장 성공 후 스냅샷과 함께 기록
+        self.fetched_listings: List[Tuple[str, str]] = []
+        ensure_resources(self.resources)
 
     @abstractmethod
     def get_crawling_data(self) -> List[dict]:
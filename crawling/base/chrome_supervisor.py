@@ -0,0 +1,166 @@
+import atexit
+import logging
+import os
+import signal
+import threading
+
+from selenium import webdriver
+
+logger = logging.getLogger(__name__)
+
+_max_browsers = max(1, int(os.getenv("CHROME_MAX_BROWSERS", "2")))
+_slots = threading.BoundedSemaphore(_max_browsers)
+_registry: dict[int, dict] = {}
+_registry_lock = threading.Lock()
+
+class BrowserCapReached(Exception):
+    pass
+
+## 동시에 띄울 수 있는 전체 브라우저 수
+def max_browsers() -> int:
+    return _max_browsers
+
+def max_navigations() -> int:
+    return int(os.getenv("CHROME_MAX_NAVIGATIONS", "50"))
+
+def max_rss_bytes() -> int:
+    return int(float(os.getenv("CHROME_MAX_RSS_MB", "300")) * 1024 * 1024)
+
+## /proc 기반 하위 프로세스 트리 pid 목록 (Linux 외 환경에서는 루트 pid 만 반환)
+def process_tree(root_pid: int) -> list[int]:
+    children: dict[int, list[int]] = {}
+    try:
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "r") as f:
+                    # comm 에 공백/괄호가 있을 수 있으므로 마지막 ')' 이후를 파싱
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    except OSError:
+        return [root_pid]
+
+    tree, stack = [], [root_pid]
+    while stack:
+        pid = stack.pop()
+        tree.append(pid)
+        stack.extend(children.get(pid, ()))
+    return tree
+
+def _rss_of(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+def _service_pid(driver: webdriver.Chrome) -> int | None:
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+## 프로세스 트리 전체의 RSS (bytes)
+def tree_rss(root_pid: int) -> int:
+    return sum(_rss_of(pid) for pid in process_tree(root_pid))
+
+## chromedriver + Chrome 프로세스 트리 전체의 RSS (bytes)
+def driver_rss(driver: webdriver.Chrome) -> int:
+    pid = _service_pid(driver)
+    return tree_rss(pid) if pid else 0
+
+## 전역 브라우저 수 제한 (wait=False 면 즉시 실패)
+def acquire_slot(wait: bool = True):
+    timeout = float(os.getenv("CHROME_SLOT_TIMEOUT", "300"))
+    if not _slots.acquire(blocking=wait, timeout=timeout if wait else None):
+        raise BrowserCapReached(f"동시 실행 가능한 브라우저 수({_max_browsers}) 초과")
+
+def release_slot():
+    try:
+        _slots.release()
+    except ValueError:
+        pass
+
+def register(driver: webdriver.Chrome):
+    with _registry_lock:
+        _registry[id(driver)] = {"driver": driver, "pid": _service_pid(driver), "navigations": 0}
+
+## 페이지 이동 1회 기록
+def record_navigation(driver: webdriver.Chrome, count: int = 1):
+    with _registry_lock:
+        info = _registry.get(id(driver))
+        if info:
+            info["navigations"] += count
+
+## 이동 횟수 또는 메모리 한도를 넘은 브라우저인지 확인
+def should_recycle(driver: webdriver.Chrome) -> bool:
+    with _registry_lock:
+        info = _registry.get(id(driver))
+        navigations = info["navigations"] if info else 0
+
+    if navigations >= max_navigations():
+        return True
+
+    rss = driver_rss(driver)
+    if rss >= max_rss_bytes():
+        logger.info(f"[CHROME] 메모리 한도 초과로 재시작 (RSS {rss / 1024 / 1024:.0f}MB, 이동 {navigations}회)")
+        return True
+    return False
+
+## pid 재사용을 구분하기 위한 프로세스 식별 정보 (시작 시각, cmdline), 프로세스가 없으면 None
+def _process_identity(pid: int) -> tuple[str, bytes] | None:
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            # comm 이후 3번째 필드부터 시작하므로 starttime(22번째 필드)은 19번째
+            start_time = f.read().rsplit(")", 1)[1].split()[19]
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            cmdline = f.read()
+    except (OSError, IndexError):
+        return None
+    return start_time, cmdline
+
+## quit 이전에 확인한 프로세스와 같은 프로세스(시작 시각 동일, chromedriver / Chrome cmdline)만 강제 종료
+def _kill_tree(processes: list[tuple[int, tuple[str, bytes]]]):
+    for pid, identity in reversed(processes):
+        if _process_identity(pid) != identity or b"chrom" not in identity[1].lower():
+            continue
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+
+## 드라이버 종료 + 남은 Chrome 프로세스 정리 + 슬롯 반환
+def quit_driver(driver: webdriver.Chrome | None):
+    if driver is None:
+        return
+
+    with _registry_lock:
+        info = _registry.pop(id(driver), None)
+
+    pid = info["pid"] if info else _service_pid(driver)
+    processes = [(p, _process_identity(p)) for p in (process_tree(pid) if pid else [])]
+    try:
+        driver.quit()
+    except Exception as e:
+        logger.warning(f"[CHROME] 드라이버 종료 실패: {e}")
+    finally:
+        # quit 이후에도 남아 있는 (고아) 프로세스 강제 종료 (그 사이 pid 가 재사용된 프로세스는 제외)
+        _kill_tree([(p, identity) for p, identity in processes if identity is not None])
+        if info is not None:
+            release_slot()
+
+## 프로세스 종료 시 남은 드라이버 정리
+@atexit.register
+def shutdown_all():
+    with _registry_lock:
+        drivers = [info["driver"] for info in _registry.values()]
+    if drivers:
+        logger.info(f"[CHROME] 종료되지 않은 드라이버 {len(drivers)}개 정리")
+    for driver in drivers:
+        quit_driver(driver)
@@ -0,0 +1,240 @@
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, List, Tuple
+
+from bs4 import Tag
+
+_LABEL_NOISE = re.compile(r"[\s:：/]")
+
+# "감독 : 홍길동" -> "감독", 비교용 라벨 정규화 (공백, 콜론, 슬래시 제거)
+def normalize_label(text: str) -> str:
+    return _LABEL_NOISE.sub("", text or "")
+
+## 필드 하나의 추출 규칙
+## labels: 행 라벨에 포함(또는 prefix=True 면 시작)되어야 하는 문자열
+## source: "value" 면 값 요소, "label" 이면 라벨 요소, "nth" 면 라벨과 같은 순번의 값 요소(dl 전용, dt / dd 를 순번으로 짝지음)의 텍스트 사용
+## kind: "text" | "list" (a 태그 우선, 없으면 split 기준 분리) | "int" (pattern 의 첫 그룹)
+## strip: 텍스트 앞에서 제거할 정규식 / pattern: "int" 용 정규식 / post: 최종 값 후처리
+@dataclass(frozen=True)
+class Field:
+    name: str
+    labels: Tuple[str, ...]
+    kind: str = "text"
+    source: str = "value"
+    prefix: bool = False
+    links: bool = True
+    split: str = ","
+    strip: str | None = None
+    pattern: str | None = None
+    post: Callable[[Any], Any] | None = None
+    default: Any = None
+
+## 사이트 상세 정보 영역의 구조 + 필드 목록
+## layout: "dl" (dt 라벨 / dd 값), "p" (p 한 줄에 라벨과 값), "li" (li 안의 em 라벨 / span 값)
+@dataclass(frozen=True)
+class ExtractionSpec:
+    layout: str
+    fields: Tuple[Field, ...]
+    label_selector: str = "em"
+    value_selector: str = "span"
+
+    def compile(self) -> "Extractor":
+        return Extractor(self)
+
+# 라벨 매칭 / 값 추출에 필요한 정규식을 미리 컴파일한 필드
+@dataclass
+class _CompiledField:
+    spec: Field
+    labels: Tuple[str, ...]
+    strip: re.Pattern | None
+    pattern: re.Pattern | None
+    accumulate: bool = field(init=False)
+
+    def __post_init__(self):
+        self.accumulate = self.spec.kind == "list"
+
+    def matches(self, label: str) -> bool:
+        if self.spec.prefix:
+            return any(label.startswith(candidate) for candidate in self.labels)
+        return any(candidate in label for candidate in self.labels)
+
+    def read(self, label_tag: Tag, value_tag: Tag | None, nth_tag: Tag | None = None):
+        source = self.spec.source
+        target = label_tag if source == "label" else nth_tag if source == "nth" else value_tag
+        if target is None:
+            return None
+
+        if self.spec.kind == "list" and self.spec.links:
+            anchors = [a.get_text(strip=True) for a in target.find_all("a")]
+            anchors = [a for a in anchors if a]
+            if anchors:
+                return anchors
+
+        text = target.get_text(separator=self.spec.split if self.spec.kind == "list" else "", strip=True)
+        if self.strip is not None:
+            text = self.strip.sub("", text, count=1).strip()
+
+        if self.spec.kind == "int":
+            match = self.pattern.search(text) if self.pattern else None
+            value = int(match.group(1)) if match else None
+        elif self.spec.kind == "list":
+            value = [item.strip() for item in text.split(self.spec.split) if item.strip()]
+        else:
+            value = text
+
+        if value and self.spec.post is not None:
+            value = self.spec.post(value)
+        return value or None
+
+## 정보 영역을 한 번만 순회하며 모든 필드를 채우는 추출기
+class Extractor:
+
+    def __init__(self, spec: ExtractionSpec):
+        self.spec = spec
+        self.fields = [
+            _CompiledField(
+                f,
+                tuple(normalize_label(label) for label in f.labels),
+                re.compile(f.strip) if f.strip else None,
+                re.compile(f.pattern) if f.pattern else None
+            )
+            for f in spec.fields
+        ]
+
+    # (라벨 요소, 값 요소) 행 순회
+    def _rows(self, block: Tag) -> Iterator[Tuple[Tag, Tag | None]]:
+        layout = self.spec.layout
+        if layout == "dl":
+            dl = block.find("dl")
+            if not dl:
+                return
+            current, has_value = None, False
+            for tag in dl.find_all(["dt", "dd"], recursive=False):
+                if tag.name == "dt":
+                    if current is not None and not has_value:
+                        yield current, None
+                    current, has_value = tag, False
+                elif current is not None:
+                    has_value = True
+                    yield current, tag
+            if current is not None and not has_value:
+                yield current, None
+        elif layout == "p":
+            for p in block.find_all("p"):
+                yield p, p
+        elif layout == "li":
+            for li in block.find_all("li"):
+                label = li.find(self.spec.label_selector)
+                value = li.find(self.spec.value_selector)
+                if label and value:
+                    yield label, value
+        else:
+            raise ValueError(f"지원하지 않는 layout: {layout}")
+
+    def extract(self, block: Tag | None) -> dict:
+        result = {f.spec.name: None for f in self.fields}
+
+        if block is not None:
+            # "nth" 필드용: 정보 영역 안의 i 번째 dt -> i 번째 dd
+            nth = {}
+            if self.spec.layout == "dl" and any(f.spec.source == "nth" for f in self.fields):
+                dds = block.select("dd")
+                nth = {id(dt): dds[i] for i, dt in enumerate(block.select("dt")) if i < len(dds)}
+
+            for label_tag, value_tag in self._rows(block):
+                label = normalize_label(label_tag.get_text(strip=True))
+                for f in self.fields:
+                    name = f.spec.name
+                    if (result[name] is not None and not f.accumulate) or not f.matches(label):
+                        continue
+                    value = f.read(label_tag, value_tag, nth.get(id(label_tag)))
+                    if value is None:
+                        continue
+                    result[name] = (result[name] or []) + value if f.accumulate else value
+
+        for f in self.fields:
+            if result[f.spec.name] is None:
+                default = f.spec.default
+                result[f.spec.name] = list(default) if isinstance(default, (list, tuple)) else default
+        return result
+
+# "액션, 드라마" -> ["액션"] (CGV: 대표 장르만 사용)
+def first_genre(text: str) -> List[str]:
+    genre = text.split(",")[0].strip()
+    return [genre] if genre else []
+
+# "장르 : 액션 / 120분" -> ["액션"] (MEGABOX)
+def genre_before_slash(text: str) -> List[str]:
+    genre = text.replace("장르", "").replace(":", "").strip().split("/")[0]
+    return [g.strip() for g in genre.split(",") if g.strip()]
+
+# "액션, 드라마 / 미국" -> ["액션", "드라마"] (LOTTE: 슬래시 뒤 국가 등 제거)
+def split_genres(text: str) -> List[str]:
+    return [g.strip() for g in text.split("/")[0].split(",") if g.strip()]
+
+# CGV 상세 정보 영역 (div.spec > dl) 추출 규칙, 장르는 dt 라벨 안에 값이 함께 있음
+# 상영시간은 기존 extract_runtime 과 같이 "기본 정보" dt 와 같은 순번의 dd 에서 읽음
+CGV_SPEC = ExtractionSpec(layout="dl", fields=(
+    Field("directors", labels=("감독",), kind="list", default=()),
+    Field("actors", labels=("배우",), kind="list", default=()),
+    Field("genres", labels=("장르",), source="label", strip=r"^장르\s*[:：]?\s*", post=first_genre, default=("기타",)),
+    Field("runningTime", labels=("기본 정보",), kind="int", source="nth", pattern=r"(\d+)\s*분", default=0)
+))
+
+# MEGABOX 상세 정보 영역 (div.movie-info.infoContent) 추출 규칙, p 한 줄에 라벨과 값이 함께 있음
+MEGABOX_SPEC = ExtractionSpec(layout="p", fields=(
+    Field("directors", labels=("감독",), kind="list", prefix=True, links=False, strip=r"^감독\s*[:：]?\s*", default=()),
+    Field("actors", labels=("출연진",), kind="list", prefix=True, links=False, strip=r"^출연진\s*[:：]?\s*", default=()),
+    Field("genres", labels=("장르",), post=genre_before_slash, default=("기타",)),
+    Field("runningTime", labels=("장르",), kind="int", pattern=r"(\d+)\s*분", default=0)
+))
+
+# LOTTE 상세 정보 영역 (ul.detail_info2 > li > em / span) 추출 규칙, 런타임은 장르 줄에 함께 있음
+LOTTE_SPEC = ExtractionSpec(layout="li", fields=(
+    Field("directors", labels=("감독",), kind="list", default=()),
+    Field("actors", labels=("출연",), kind="list", default=()),
+    Field("genres", labels=("장르",), post=split_genres, default=("기타",)),
+    Field("runningTime", labels=("장르",), kind="int", pattern=r"(\d+)\s*분", default=0)
+))
+
+DETAIL_SPECS = {
+    "CGV": CGV_SPEC,
+    "MEGABOX": MEGABOX_SPEC,
+    "LOTTE": LOTTE_SPEC
+}
+
+_extractors: dict = {}
+
+## 사이트별 컴파일된 추출기 (프로세스마다 1회 컴파일)
+def detail_extractor(site: str) -> Extractor:
+    extractor = _extractors.get(site)
+    if extractor is None:
+        extractor = _extractors[site] = DETAIL_SPECS[site].compile()
+    return extractor
+
+## 저장된 상세 HTML 에 대해 추출 결과 / 속도 확인
+## 사용법: python -m crawling.base.extraction_spec <사이트> <저장된 상세 HTML> [...]
+def _benchmark(site: str, paths: List[str], repeat: int = 50):
+    from crawling.base.html_parsing import DetailPage
+
+    extractor = detail_extractor(site)
+
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append(DetailPage(f.read(), site))
+
+    for path, page in zip(paths, pages):
+        print(f"{path}: {extractor.extract(page.block)}")
+
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            extractor.extract(page.block)
+    per_page = (time.perf_counter() - started) / (repeat * max(1, len(pages)))
+    print(f"{site} 추출 {len(extractor.fields)}개 필드, 페이지당 {per_page * 1_000_000:.1f}µs")
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(sys.argv[1].upper(), sys.argv[2:])
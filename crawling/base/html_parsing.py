@@ -0,0 +1,108 @@
+import html
+import importlib.util
+import logging
+import os
+import re
+import time
+
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+logger = logging.getLogger(__name__)
+
+# class 속성에 name 이 포함된 요소 (class 가 여러 개인 요소도 매칭, 문자열 class_ 는 전체 값과 비교됨)
+def has_class(name: str):
+    return lambda value: bool(value) and name in value.split()
+
+# 사이트별 상세 페이지에서 실제로 읽는 영역 (파싱 범위, 영역 선택자)
+DETAIL_SCOPES = {
+    "CGV": (SoupStrainer("div", class_=has_class("spec")), "div.spec"),
+    "MEGABOX": (SoupStrainer("div", class_=has_class("infoContent")), "div.movie-info.infoContent"),
+    "LOTTE": (SoupStrainer("ul", class_=has_class("detail_info2")), "ul.detail_info2")
+}
+
+# 사이트별 목록 페이지에서 실제로 읽는 영역
+LISTING_SCOPES = {
+    "CGV": SoupStrainer("div", class_=has_class("mm_list_item")),
+    "MEGABOX": SoupStrainer("ol", id="movieList"),
+    "LOTTE": SoupStrainer(class_=has_class("screen_add_box"))
+}
+
+_OG_DESCRIPTION = re.compile(r"<meta\b[^>]*\bproperty\s*=\s*[\"']og:description[\"'][^>]*>", re.IGNORECASE)
+_CONTENT_ATTR = re.compile(r"\bcontent\s*=\s*(\"([^\"]*)\"|'([^']*)')", re.IGNORECASE)
+
+_parser = None
+
+## HTML_PARSER 미지정 시 lxml 우선, 설치되어 있지 않으면 html.parser
+def parser_name() -> str:
+    global _parser
+
+    if _parser is None:
+        configured = os.getenv("HTML_PARSER")
+        if configured:
+            _parser = configured
+        else:
+            _parser = "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+    return _parser
+
+def parse_html(markup: str | bytes, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+    return BeautifulSoup(markup, parser_name(), parse_only=parse_only)
+
+## 목록 페이지 중 목록 항목 영역만 파싱
+def parse_listing(markup: str | bytes, site: str) -> BeautifulSoup:
+    return parse_html(markup, LISTING_SCOPES.get(site))
+
+## <meta property="og:description"> 값을 트리 생성 없이 추출
+def extract_og_description(markup: str | bytes) -> str:
+    if isinstance(markup, bytes):
+        markup = markup.decode("utf-8", errors="replace")
+
+    meta = _OG_DESCRIPTION.search(markup)
+    if not meta:
+        return ""
+    content = _CONTENT_ATTR.search(meta.group(0))
+    if not content:
+        return ""
+    return html.unescape(content.group(2) if content.group(2) is not None else content.group(3)).strip()
+
+## 상세 페이지를 한 번만 파싱한 결과 (필요한 영역 + 줄거리)
+class DetailPage:
+
+    def __init__(self, markup: str | bytes, site: str):
+        strainer, selector = DETAIL_SCOPES[site]
+        self.site = site
+        self.description = extract_og_description(markup)
+        self.soup = parse_html(markup, strainer)
+        self.block: Tag | None = self.soup.select_one(selector)
+
+## 기존 방식 (전체 문서 html.parser + 영역 반복 탐색) 과 비교
+## 사용법: python -m crawling.base.html_parsing <사이트> <저장된 상세 HTML> [...]
+def _benchmark(site: str, paths: list[str], repeat: int = 20):
+    _, selector = DETAIL_SCOPES[site]
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+
+    def legacy(markup):
+        soup = BeautifulSoup(markup, "html.parser")
+        # 필드(상영시간 / 장르 / 감독·배우)마다 영역을 다시 탐색
+        for _ in range(3):
+            soup.select_one(selector)
+        meta = soup.find("meta", attrs={"property": "og:description"})
+        return meta.get("content", "") if meta else ""
+
+    def scoped(markup):
+        page = DetailPage(markup, site)
+        return page.description
+
+    for name, func in (("html.parser 전체 파싱", legacy), (f"{parser_name()} 영역 파싱", scoped)):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for markup in pages:
+                func(markup)
+        per_page = (time.perf_counter() - started) / (repeat * len(pages))
+        print(f"{name}: 페이지당 {per_page * 1000:.2f}ms")
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(sys.argv[1].upper(), sys.argv[2:])
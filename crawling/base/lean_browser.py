@@ -0,0 +1,113 @@
+import json
+import logging
+import os
+from collections import Counter
+
+from selenium import webdriver
+
+logger = logging.getLogger(__name__)
+
+# 리소스 유형별 차단 URL 패턴 (Network.setBlockedURLs 와일드카드)
+RESOURCE_PATTERNS = {
+    "image": ["*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.png", "*.png?*", "*.gif", "*.gif?*",
+              "*.webp", "*.webp?*", "*.svg", "*.svg?*", "*.ico"],
+    "font": ["*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*", "*.otf", "*.eot"],
+    "stylesheet": ["*.css", "*.css?*"],
+    "media": ["*.mp4", "*.mp4?*", "*.webm", "*.m3u8", "*.ts?*", "*.mp3", "*youtube.com/embed*", "*player.vimeo.com*"],
+    "tracker": ["*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+                "*adservice.google.*", "*facebook.net*", "*connect.facebook.*", "*criteo.*", "*naver.net/wcslog*",
+                "*wcs.naver.*", "*kakao.com/pixel*", "*t1.daumcdn.net/kas*", "*mobon.net*", "*dable.io*",
+                "*hotjar.com*", "*clarity.ms*"]
+}
+
+# 사이트별 차단 유형 (MEGABOX 는 .btn-more 의 is_displayed 판정에 CSS 가 필요)
+SITE_PROFILES = {
+    "CGV": {"image", "font", "stylesheet", "media", "tracker"},
+    "MEGABOX": {"image", "font", "media", "tracker"},
+    "LOTTE": {"image", "font", "stylesheet", "media", "tracker"},
+    "DEFAULT": {"image", "font", "media", "tracker"}
+}
+
+def is_headless() -> bool:
+    return os.getenv("WEBDRIVER_HEADLESS", "true").lower() == "true"
+
+## LEAN_BROWSER=auto(기본) 이면 headless 실행에서만 사용
+def is_enabled() -> bool:
+    mode = os.getenv("LEAN_BROWSER", "auto").lower()
+    if mode == "auto":
+        return is_headless()
+    return mode == "true"
+
+def is_report_enabled() -> bool:
+    return os.getenv("LEAN_BROWSER_REPORT", "false").lower() == "true"
+
+## 사이트별 차단 유형 (LEAN_BROWSER_BLOCK_<SITE> 로 유형 목록 덮어쓰기 가능)
+def blocked_types(site: str | None) -> set[str]:
+    site = (site or "DEFAULT").upper()
+    override = os.getenv(f"LEAN_BROWSER_BLOCK_{site}")
+    if override is not None:
+        return {v.strip() for v in override.split(",") if v.strip()}
+    return set(SITE_PROFILES.get(site, SITE_PROFILES["DEFAULT"]))
+
+## 사이트별 차단 패턴
+def blocked_patterns(site: str | None) -> list[str]:
+    types = blocked_types(site)
+    patterns = [pattern for kind in sorted(types) for pattern in RESOURCE_PATTERNS.get(kind, ())]
+    patterns += [v.strip() for v in os.getenv("LEAN_BROWSER_EXTRA_PATTERNS", "").split(",") if v.strip()]
+    return patterns
+
+## 드라이버 생성 옵션에 성능 로그 수집 설정 추가 (리포트 / 네트워크 캡처 사용 시)
+def configure_options(chrome_options, capture_network: bool = False):
+    if capture_network or (is_enabled() and is_report_enabled()):
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+## CDP 로 불필요한 리소스 요청 차단
+def apply_lean_mode(driver: webdriver.Chrome, site: str | None = None) -> bool:
+    if not is_enabled():
+        return False
+
+    patterns = blocked_patterns(site)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+        logger.info(f"[LEAN] {site or 'DEFAULT'} 차단 패턴 {len(patterns)}개 적용")
+        return True
+    except Exception as e:
+        logger.warning(f"[LEAN] 리소스 차단 설정 실패: {e}")
+        return False
+
+## 성능 로그에서 Network 이벤트만 추출 (로그는 읽는 즉시 비워짐)
+def drain_network_events(driver: webdriver.Chrome) -> list[dict]:
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return []
+
+    events = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method", "").startswith("Network."):
+            events.append(message)
+    return events
+
+## 페이지 단위 차단 요청 수 / 실제 전송 바이트 리포트
+def report_page(driver: webdriver.Chrome, label: str):
+    if not (is_enabled() and is_report_enabled()):
+        return
+
+    blocked = Counter()
+    loaded, transferred = 0, 0
+    for event in drain_network_events(driver):
+        params = event.get("params", {})
+        if event["method"] == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked[params.get("type", "Other")] += 1
+        elif event["method"] == "Network.loadingFinished":
+            loaded += 1
+            transferred += int(params.get("encodedDataLength", 0))
+
+    detail = ", ".join(f"{kind}={count}" for kind, count in blocked.most_common()) or "없음"
+    logger.info(f"[LEAN] {label}: 차단 {sum(blocked.values())}건 ({detail}), "
+                f"로딩 {loaded}건 / {transferred / 1024:.1f}KB")
@@ -0,0 +1,123 @@
+import asyncio
+import logging
+import os
+import time
+
+from selenium import webdriver
+
+logger = logging.getLogger(__name__)
+
+# 새 문서마다 먼저 실행되는 probe: 진행 중인 XHR/fetch 수와 마지막 DOM 변경 시각 기록
+SETTLE_PROBE_SCRIPT = """
+(function () {
+    if (window.__settle) { return; }
+    var state = window.__settle = { pending: 0, lastChange: Date.now() };
+    var touch = function () { state.lastChange = Date.now(); };
+    var done = function () { state.pending = Math.max(0, state.pending - 1); touch(); };
+
+    var send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending += 1;
+        touch();
+        this.addEventListener("loadend", done);
+        return send.apply(this, arguments);
+    };
+
+    if (window.fetch) {
+        var fetch = window.fetch;
+        window.fetch = function () {
+            state.pending += 1;
+            touch();
+            return fetch.apply(this, arguments).then(
+                function (response) { done(); return response; },
+                function (error) { done(); throw error; }
+            );
+        };
+    }
+
+    new MutationObserver(touch).observe(document, {
+        childList: true, subtree: true, attributes: true, characterData: true
+    });
+})();
+"""
+
+SETTLE_STATE_SCRIPT = """
+var s = window.__settle;
+return s ? [s.pending, Date.now() - s.lastChange, document.readyState] : null;
+"""
+
+def _settle_options() -> tuple[float, float, float]:
+    return (
+        float(os.getenv("PAGE_SETTLE_QUIET_MS", "500")) / 1000,
+        float(os.getenv("PAGE_SETTLE_MIN_WAIT", "0.2")),
+        float(os.getenv("PAGE_SETTLE_TIMEOUT", "10"))
+    )
+
+## CDP 로 이후 열리는 모든 문서에 probe 주입 (드라이버 생성 직후 1회)
+def install_settle_probe(driver: webdriver.Chrome) -> bool:
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": SETTLE_PROBE_SCRIPT})
+        return True
+    except Exception as e:
+        logger.warning(f"[SETTLE] CDP probe 주입 실패, 페이지 단위로 주입: {e}")
+        return False
+
+## 진행 중인 요청이 없고 DOM 변경이 quiet 시간 이상 멈출 때까지 대기 (하한 min_wait, 상한 timeout)
+## 안정화되면 True, 상한에 도달하면 False
+def wait_for_settle(driver: webdriver.Chrome,
+                    quiet: float | None = None,
+                    min_wait: float | None = None,
+                    timeout: float | None = None,
+                    poll: float = 0.1) -> bool:
+    default_quiet, default_min_wait, default_timeout = _settle_options()
+    quiet = default_quiet if quiet is None else quiet
+    min_wait = default_min_wait if min_wait is None else min_wait
+    timeout = default_timeout if timeout is None else timeout
+
+    started = time.monotonic()
+    while True:
+        elapsed = time.monotonic() - started
+        state = driver.execute_script(SETTLE_STATE_SCRIPT)
+
+        if state is None:
+            # CDP 주입 전에 열린 문서: 지금부터 관찰 (이미 시작된 요청은 집계되지 않음)
+            driver.execute_script(SETTLE_PROBE_SCRIPT)
+        else:
+            pending, idle_ms, ready_state = state
+            if (elapsed >= min_wait and ready_state == "complete"
+                    and pending == 0 and idle_ms / 1000 >= quiet):
+                return True
+
+        if elapsed >= timeout:
+            logger.info(f"[SETTLE] {timeout:.1f}초 내 안정화되지 않음 (state={state})")
+            return False
+        time.sleep(poll)
+
+## wait_for_settle 의 비동기 버전 (Playwright page 용, probe 는 context.add_init_script 로 주입)
+async def wait_for_settle_async(page,
+                                quiet: float | None = None,
+                                min_wait: float | None = None,
+                                timeout: float | None = None,
+                                poll: float = 0.1) -> bool:
+    default_quiet, default_min_wait, default_timeout = _settle_options()
+    quiet = default_quiet if quiet is None else quiet
+    min_wait = default_min_wait if min_wait is None else min_wait
+    timeout = default_timeout if timeout is None else timeout
+
+    started = time.monotonic()
+    while True:
+        elapsed = time.monotonic() - started
+        state = await page.evaluate(f"() => {{ {SETTLE_STATE_SCRIPT} }}")
+
+        if state is None:
+            await page.evaluate(SETTLE_PROBE_SCRIPT)
+        else:
+            pending, idle_ms, ready_state = state
+            if (elapsed >= min_wait and ready_state == "complete"
+                    and pending == 0 and idle_ms / 1000 >= quiet):
+                return True
+
+        if elapsed >= timeout:
+            logger.info(f"[SETTLE] {timeout:.1f}초 내 안정화되지 않음 (state={state})")
+            return False
+        await asyncio.sleep(poll)
@@ -0,0 +1,147 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import List
+
+from crawling.base.extraction_spec import DETAIL_SPECS, detail_extractor
+from crawling.base.html_parsing import DetailPage
+
+logger = logging.getLogger(__name__)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_sessions = 0
+
+## PARSE_WORKERS 미지정 시 2 (CPU 가 1개면 1), 0 이면 프로세스 풀 없이 현재 프로세스에서 파싱
+## worker 마다 별도 인터프리터가 떠 있으므로 dyno 메모리 한도(CHROME_MAX_RSS_MB 등)와 함께 조정
+def parse_workers() -> int:
+    configured = os.getenv("PARSE_WORKERS")
+    if configured is not None and configured.strip() != "":
+        return max(0, int(configured))
+    return min(2, os.cpu_count() or 1)
+
+## 상세 페이지 원문 -> 필드 dict (worker 에서 실행, ES / 캐시 조회 없이 순수 파싱만)
+## markup 이 없으면 추출 규칙의 기본값
+def parse_detail_fields(site: str, markup: str | bytes | None) -> dict:
+    page = DetailPage(markup, site) if markup else None
+    fields = detail_extractor(site).extract(page.block if page else None)
+    fields["plot"] = page.description if page and page.description else "정보없음"
+    return fields
+
+def _warm_up(sites: tuple):
+    for site in sites:
+        detail_extractor(site)
+
+## 전역 파싱 프로세스 풀 (크롤러 간 공유, 스레드 상태를 복제하지 않도록 기본 spawn 으로 시작)
+def get_parse_pool() -> ProcessPoolExecutor | None:
+    global _pool
+
+    if _pool is None and parse_workers() > 0:
+        with _pool_lock:
+            if _pool is None:
+                workers = parse_workers()
+                context = multiprocessing.get_context(os.getenv("PARSE_START_METHOD", "spawn"))
+                _pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=context,
+                    initializer=_warm_up,
+                    initargs=(tuple(DETAIL_SPECS),)
+                )
+                logger.info(f"[PARSE] 파싱 프로세스 풀 시작 (worker {workers}개)")
+    return _pool
+
+@atexit.register
+def shutdown_parse_pool():
+    global _pool
+
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+## 크롤링 실행 동안만 풀 유지 (동시에 실행 중인 크롤러가 모두 끝나면 worker 종료, 다음 실행 때 다시 시작)
+@contextmanager
+def parse_session():
+    global _pool, _sessions
+
+    with _pool_lock:
+        _sessions += 1
+    try:
+        yield
+    finally:
+        with _pool_lock:
+            _sessions -= 1
+            pool = None
+            if _sessions == 0:
+                pool, _pool = _pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+            logger.info("[PARSE] 파싱 프로세스 풀 종료")
+
+## 파싱 작업 제출 (풀이 없으면 즉시 실행한 결과를 담은 Future)
+def submit_detail(site: str, markup: str | bytes | None) -> Future:
+    pool = get_parse_pool() if markup else None
+    if pool is not None:
+        try:
+            return pool.submit(parse_detail_fields, site, markup)
+        except BrokenProcessPool as e:
+            logger.warning(f"[PARSE] 파싱 프로세스 풀 사용 불가, 현재 프로세스에서 파싱: {e}")
+            shutdown_parse_pool()
+
+    future = Future()
+    try:
+        future.set_result(parse_detail_fields(site, markup))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+## 상세 페이지 하나를 worker 에서 파싱하고 결과를 기다림 (I/O 스레드에서 호출)
+def parse_detail(site: str, markup: str | bytes | None) -> dict:
+    try:
+        return submit_detail(site, markup).result()
+    except BrokenProcessPool as e:
+        # worker 가 비정상 종료된 경우 (메모리 부족 등) 풀을 버리고 현재 프로세스에서 다시 파싱
+        logger.warning(f"[PARSE] 파싱 worker 비정상 종료, 현재 프로세스에서 파싱: {e}")
+        shutdown_parse_pool()
+        return parse_detail_fields(site, markup)
+
+## 현재 프로세스 파싱과 프로세스 풀 파싱의 처리량 비교
+## 사용법: python -m crawling.base.parse_pool <사이트> <저장된 상세 HTML> [...]
+def _benchmark(site: str, paths: List[str], repeat: int = 50):
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+    jobs = pages * repeat
+
+    started = time.perf_counter()
+    for markup in jobs:
+        parse_detail_fields(site, markup)
+    inline = time.perf_counter() - started
+
+    pool = get_parse_pool()
+    if pool is None:
+        print(f"현재 프로세스: {len(jobs) / inline:.1f} pages/s (PARSE_WORKERS=0)")
+        return
+    # worker 시작 / import 비용은 측정에서 제외
+    list(pool.map(_warm_up, [(site,)] * parse_workers()))
+
+    started = time.perf_counter()
+    futures = [submit_detail(site, markup) for markup in jobs]
+    for future in futures:
+        future.result()
+    pooled = time.perf_counter() - started
+
+    print(f"현재 프로세스: {len(jobs) / inline:.1f} pages/s / "
+          f"프로세스 풀 ({parse_workers()}개): {len(jobs) / pooled:.1f} pages/s (x{inline / pooled:.2f})")
+    shutdown_parse_pool()
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(sys.argv[1].upper(), sys.argv[2:])
@@ -0,0 +1,382 @@
+import asyncio
+import fnmatch
+import logging
+import os
+import threading
+import time
+from typing import Callable
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions
+from selenium.webdriver.support.ui import WebDriverWait
+
+from crawling.base.chrome_supervisor import acquire_slot, max_navigations, max_rss_bytes, process_tree, release_slot, \
+    tree_rss
+from crawling.base.lean_browser import RESOURCE_PATTERNS, blocked_types, is_enabled as is_lean_enabled, \
+    is_headless, report_page
+from crawling.base.page_settle import SETTLE_PROBE_SCRIPT, wait_for_settle, wait_for_settle_async
+from crawling.base.webdriver_config import click_until_disappear, scroll_until_loaded
+from crawling.base.webdriver_pool import WebDriverPool
+from crawling.base.xhr_capture import capture_json_response
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36"
+
+_engine = None
+_engine_lock = threading.Lock()
+
+## RENDER_BACKEND=selenium(기본) | playwright
+def backend_name() -> str:
+    return os.getenv("RENDER_BACKEND", "selenium").lower()
+
+## Selenium 백엔드: 사이트별 WebDriverPool 을 스레드에서 공유
+class SeleniumSession:
+
+    def __init__(self, site: str, size: int | None = None, capture_network: bool = False):
+        self.site = site
+        self.pool = WebDriverPool(size=size, site=site, capture_network=capture_network)
+        self.workers = self.pool.size
+
+    def __enter__(self):
+        self.pool.warm_up()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.pool.close()
+
+    ## 페이지 HTML 반환 (wait_selector 대기 / 무한 스크롤 / 더보기 버튼 클릭 중 하나), 실패하면 None
+    def render(self, url: str, wait_selector: str | None = None, scroll: bool = False,
+               click_selector: str | None = None, timeout: float = 10) -> str | None:
+        try:
+            with self.pool.driver() as driver:
+                driver.get(url)
+                if wait_selector:
+                    WebDriverWait(driver, timeout).until(
+                        expected_conditions.presence_of_element_located((By.CSS_SELECTOR, wait_selector))
+                    )
+                elif scroll:
+                    scroll_until_loaded(driver)
+                elif click_selector:
+                    click_until_disappear(driver, click_selector)
+                else:
+                    wait_for_settle(driver)
+                report_page(driver, url)
+                return driver.page_source
+        except Exception as e:
+            logger.warning(f"[RENDER] {self.site} 페이지 로딩 실패: {url} ({e})")
+            return None
+
+    def capture_json(self, url: str, url_pattern: str, accept: Callable[[dict], bool] = lambda data: True,
+                     timeout: float = 10) -> dict | None:
+        try:
+            with self.pool.driver() as driver:
+                return capture_json_response(driver, url, url_pattern, accept, timeout)
+        except Exception as e:
+            logger.warning(f"[RENDER] {self.site} API 응답 캡처 실패: {url} ({e})")
+            return None
+
+def _is_playwright(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return b"playwright" in f.read()
+    except OSError:
+        return False
+
+## Playwright 백엔드: 브라우저 프로세스 하나를 백그라운드 이벤트 루프에서 공유하고 사이트별로 context 분리
+## 브라우저는 Chrome 감독의 전역 슬롯 1개를 차지하고, 이동 횟수 / 메모리 한도를 넘으면 세션이 모두 닫힐 때 재시작
+class PlaywrightEngine:
+
+    def __init__(self, max_pages: int | None = None):
+        self.max_pages = max_pages or int(os.getenv("PLAYWRIGHT_MAX_PAGES", "8"))
+        self.navigations = 0
+        self.sessions = 0
+        self._pids: list[int] = []
+        self._playwright = None
+        self._semaphore = None
+
+        acquire_slot()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="render-loop", daemon=True)
+        self._thread.start()
+        try:
+            before = set(process_tree(os.getpid()))
+            self.browser = self.submit(self._launch())
+            # 새로 뜬 Playwright 드라이버 프로세스 (하위에 Chromium, RSS 측정용)
+            self._pids = [pid for pid in process_tree(os.getpid()) if pid not in before and _is_playwright(pid)]
+        except BaseException:
+            self._stop_loop()
+            release_slot()
+            raise
+
+    def _stop_loop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        if not self._thread.is_alive():
+            self._loop.close()
+
+    ## Playwright 드라이버 + Chromium 프로세스 전체의 RSS (bytes)
+    def rss(self) -> int:
+        return sum(tree_rss(pid) for pid in self._pids if os.path.exists(f"/proc/{pid}"))
+
+    def should_recycle(self) -> bool:
+        if self.navigations >= max_navigations():
+            return True
+        rss = self.rss()
+        if rss >= max_rss_bytes():
+            logger.info(f"[RENDER] Playwright 메모리 한도 초과로 재시작 (RSS {rss / 1024 / 1024:.0f}MB, 이동 {self.navigations}회)")
+            return True
+        return False
+
+    def submit(self, coro, timeout: float | None = None):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    async def _launch(self):
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._semaphore = asyncio.Semaphore(self.max_pages)
+        browser = await self._playwright.chromium.launch(
+            headless=is_headless(),
+            executable_path=os.getenv("PLAYWRIGHT_CHROMIUM_PATH") or None,
+            args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"]
+        )
+        logger.info(f"[RENDER] Playwright 브라우저 시작 (동시 페이지 {self.max_pages})")
+        return browser
+
+    ## 사이트 단위로 분리된 context (쿠키/캐시 공유 안 함) + lean 차단 + settle probe
+    async def new_context(self, site: str):
+        context = await self.browser.new_context(user_agent=USER_AGENT)
+        await context.add_init_script(SETTLE_PROBE_SCRIPT)
+
+        if is_lean_enabled():
+            types = blocked_types(site)
+            trackers = RESOURCE_PATTERNS["tracker"] if "tracker" in types else []
+
+            async def block(route):
+                request = route.request
+                if request.resource_type in types or any(fnmatch.fnmatch(request.url, p) for p in trackers):
+                    await route.abort()
+                else:
+                    await route.continue_()
+
+            await context.route("**/*", block)
+        return context
+
+    async def render(self, context, url: str, wait_selector: str | None = None, scroll: bool = False,
+                     click_selector: str | None = None, timeout: float = 10) -> str:
+        async with self._semaphore:
+            page = await context.new_page()
+            self.navigations += 1
+            try:
+                await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+                if wait_selector:
+                    await page.wait_for_selector(wait_selector, state="attached", timeout=timeout * 1000)
+                elif scroll:
+                    await self._scroll_until_loaded(page)
+                elif click_selector:
+                    await self._click_until_disappear(page, click_selector, timeout)
+                else:
+                    await wait_for_settle_async(page)
+                return await page.content()
+            finally:
+                await page.close()
+
+    @staticmethod
+    async def _scroll_until_loaded(page, max_scroll: int = 50):
+        await wait_for_settle_async(page)
+        prev_height = await page.evaluate("document.body.scrollHeight")
+        for _ in range(max_scroll):
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await wait_for_settle_async(page)
+            new_height = await page.evaluate("document.body.scrollHeight")
+            if new_height == prev_height:
+                break
+            prev_height = new_height
+
+    @staticmethod
+    async def _click_until_disappear(page, css_selector: str, timeout: float, max_clicks: int = 50,
+                                     max_seconds: float = 120):
+        button = page.locator(css_selector).first
+        deadline = time.monotonic() + max_seconds
+        for _ in range(max_clicks):
+            if time.monotonic() >= deadline:
+                logger.info(f"[RENDER] {max_seconds:.0f}초 내 더보기 버튼이 사라지지 않음: {css_selector}")
+                break
+            if not await button.count() or not await button.is_visible():
+                break
+            await button.click(timeout=timeout * 1000)
+            await wait_for_settle_async(page)
+
+    async def capture_json(self, context, url: str, url_pattern: str, accept: Callable[[dict], bool],
+                           timeout: float = 10) -> dict | None:
+        async with self._semaphore:
+            page = await context.new_page()
+            self.navigations += 1
+            found = asyncio.get_running_loop().create_future()
+
+            async def on_response(response):
+                if found.done() or url_pattern not in response.url:
+                    return
+                try:
+                    data = await response.json()
+                except Exception:
+                    return
+                if isinstance(data, dict) and accept(data) and not found.done():
+                    found.set_result(data)
+
+            page.on("response", lambda response: asyncio.ensure_future(on_response(response)))
+            try:
+                await page.goto(url, wait_until="domcontentloaded", timeout=timeout * 1000)
+                return await asyncio.wait_for(found, timeout)
+            except asyncio.TimeoutError:
+                logger.info(f"[XHR] {timeout:.0f}초 내 {url_pattern} 응답을 찾지 못함: {url}")
+                return None
+            finally:
+                await page.close()
+
+    def close(self):
+        async def _close():
+            await self.browser.close()
+            await self._playwright.stop()
+
+        try:
+            self.submit(_close(), timeout=30)
+        finally:
+            self._stop_loop()
+            release_slot()
+
+## 공유 엔진을 세션 하나가 사용하기 시작
+def open_playwright_engine() -> PlaywrightEngine:
+    global _engine
+
+    with _engine_lock:
+        if _engine is None:
+            _engine = PlaywrightEngine()
+        _engine.sessions += 1
+        return _engine
+
+## 세션 종료, 마지막 세션이 닫힐 때 이동 횟수 / 메모리 한도를 넘었으면 브라우저 종료 (다음 세션에서 재시작)
+def release_playwright_engine(engine: PlaywrightEngine):
+    global _engine
+
+    with _engine_lock:
+        engine.sessions -= 1
+        if engine.sessions > 0 or engine is not _engine or not engine.should_recycle():
+            return
+        _engine = None
+    engine.close()
+
+def close_playwright_engine():
+    global _engine
+
+    with _engine_lock:
+        if _engine is not None:
+            engine, _engine = _engine, None
+            engine.close()
+
+## 공유 Playwright 브라우저 위의 사이트 전용 context (여러 크롤러 스레드에서 동시에 호출 가능)
+class PlaywrightSession:
+
+    def __init__(self, site: str, size: int | None = None, capture_network: bool = False):
+        self.site = site
+        self.engine = open_playwright_engine()
+        self.workers = size or self.engine.max_pages
+        self.context = None
+
+    def __enter__(self):
+        try:
+            self.context = self.engine.submit(self.engine.new_context(self.site))
+        except BaseException:
+            release_playwright_engine(self.engine)
+            raise
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if self.context is not None:
+                self.engine.submit(self.context.close())
+                self.context = None
+        finally:
+            release_playwright_engine(self.engine)
+
+    def render(self, url: str, wait_selector: str | None = None, scroll: bool = False,
+               click_selector: str | None = None, timeout: float = 10) -> str | None:
+        try:
+            return self.engine.submit(
+                self.engine.render(self.context, url, wait_selector, scroll, click_selector, timeout)
+            )
+        except Exception as e:
+            logger.warning(f"[RENDER] {self.site} 페이지 로딩 실패: {url} ({e})")
+            return None
+
+    def capture_json(self, url: str, url_pattern: str, accept: Callable[[dict], bool] = lambda data: True,
+                     timeout: float = 10) -> dict | None:
+        try:
+            return self.engine.submit(self.engine.capture_json(self.context, url, url_pattern, accept, timeout))
+        except Exception as e:
+            logger.warning(f"[RENDER] {self.site} API 응답 캡처 실패: {url} ({e})")
+            return None
+
+## 설정된 백엔드의 렌더링 세션 (playwright 를 사용할 수 없으면 selenium 으로 대체)
+def open_render_session(site: str, size: int | None = None, capture_network: bool = False):
+    if backend_name() == "playwright":
+        try:
+            return PlaywrightSession(site, size, capture_network)
+        except ImportError:
+            logger.warning("[RENDER] playwright 미설치, selenium 백엔드 사용")
+        except Exception as e:
+            logger.warning(f"[RENDER] Playwright 시작 실패, selenium 백엔드 사용: {e}")
+    return SeleniumSession(site, size, capture_network)
+
+## 현재 프로세스 트리 (브라우저 포함) RSS 최대값 측정
+class _PeakRssSampler:
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, tree_rss(os.getpid()))
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join()
+
+## 백엔드별 초당 페이지 수 / 최대 RSS 비교
+## 사용법: python -m crawling.base.render_backend <사이트> <URL> [URL ...]
+def _benchmark(site: str, urls: list[str]):
+    from concurrent.futures import ThreadPoolExecutor
+
+    for name in ("selenium", "playwright"):
+        os.environ["RENDER_BACKEND"] = name
+        try:
+            started = time.perf_counter()
+            with _PeakRssSampler() as sampler, open_render_session(site) as session:
+                if name == "playwright" and not isinstance(session, PlaywrightSession):
+                    print(f"{name}: 사용할 수 없음")
+                    continue
+                with ThreadPoolExecutor(max_workers=session.workers) as executor:
+                    pages = list(executor.map(session.render, urls))
+            elapsed = time.perf_counter() - started
+        except Exception as e:
+            print(f"{name}: 실행 실패 ({e})")
+            continue
+
+        loaded = sum(1 for page in pages if page)
+        print(f"{name}: {loaded}/{len(urls)} 페이지, {loaded / elapsed:.2f} pages/s, "
+              f"최대 RSS {sampler.peak / 1024 / 1024:.0f}MB")
+
+    close_playwright_engine()
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(sys.argv[1], sys.argv[2:])
@@ -1,4 +1,3 @@
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -6,14 +5,21 @@ from selenium.webdriver.support import expected_conditions
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.common.by import By
 
-import time
+from crawling.base.chrome_supervisor import acquire_slot, quit_driver, register, release_slot
+from crawling.base.lean_browser import apply_lean_mode, configure_options, is_headless
+from crawling.base.page_settle import install_settle_probe, wait_for_settle
+
 import logging
 
 logger = logging.getLogger(__name__)
 
-def create_driver() -> webdriver.Chrome:
+## site 를 지정하면 해당 사이트 프로필로 불필요한 리소스 차단 (lean browser)
+## 전역 브라우저 수 제한을 따르며, 종료는 반드시 quit_driver 로 (wait=False 면 한도 초과 시 BrowserCapReached)
+## capture_network=True 면 XHR 응답 캡처용 성능 로그 수집
+def create_driver(site: str | None = None, wait: bool = True, capture_network: bool = False) -> webdriver.Chrome:
     chrome_options = Options()
-    chrome_options.add_argument("--headless")
+    if is_headless():
+        chrome_options.add_argument("--headless")
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--disable-dev-shm-usage")
@@ -22,6 +28,7 @@ def create_driver() -> webdriver.Chrome:
     chrome_options.add_argument("--blink-settings=imagesEnabled=false")
     chrome_options.add_argument("--disable-notifications")
     chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120 Safari/537.36")
+    configure_options(chrome_options, capture_network)
 
     # 👉 Heroku에서 설치된 Chrome binary 경로
     chrome_options.binary_location = "/app/.chrome-for-testing/chrome-linux64/chrome"
@@ -29,20 +36,41 @@ def create_driver() -> webdriver.Chrome:
     # 👉 Heroku에서 설치된 ChromeDriver 경로
     driver_path = "/app/.chrome-for-testing/chromedriver-linux64/chromedriver"
 
-    return webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    acquire_slot(wait)
+    try:
+        driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+    except Exception:
+        release_slot()
+        raise
+    register(driver)
+
+    # 등록 이후 설정이 실패하면 드라이버를 종료하여 슬롯 반환
+    try:
+        install_settle_probe(driver)
+        apply_lean_mode(driver, site)
+        if capture_network:
+            driver.execute_cdp_cmd("Network.enable", {})
+    except Exception:
+        quit_driver(driver)
+        raise
+    return driver
     #
     # return webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
 
 
-def scroll_until_loaded(driver: webdriver.Chrome, max_scroll: int = 50, wait_sec: int = 1):
+## 더 이상 내용이 늘어나지 않을 때까지 스크롤 (스크롤마다 요청 / DOM 변경이 끝날 때까지 대기)
+def scroll_until_loaded(driver: webdriver.Chrome, max_scroll: int = 50, timeout: float | None = None):
+    wait_for_settle(driver, timeout=timeout)
     prev_height = driver.execute_script("return document.body.scrollHeight")
     scroll_count = 0
 
     while scroll_count < max_scroll:
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(wait_sec)
+        settled = wait_for_settle(driver, timeout=timeout)
         new_height = driver.execute_script("return document.body.scrollHeight")
         if new_height == prev_height:
+            if not settled:
+                logger.warning(f"[SETTLE] 스크롤 {scroll_count}회에서 안정화 전에 종료, 목록이 누락되었을 수 있음")
             break
         prev_height = new_height
         scroll_count += 1
@@ -66,17 +94,3 @@ def click_until_disappear(driver, css_selector: str, timeout: int = 10):
 
     except Exception as e:
         logger.warning(f"다음 페이지 버튼 클릭 중 에러 발생: {e}")
-
-def get_detail_data_with_selenium(url: str) -> BeautifulSoup | None:
-    from crawling.base.webdriver_config import create_driver
-    try:
-        driver = create_driver()
-        driver.get(url)
-        time.sleep(2)
-        html = driver.page_source
-        return BeautifulSoup(html, "html.parser")
-    except Exception as e:
-        logger.warning(f"[HTML_UTILS] Selenium 상세 페이지 요청 실패: {e}")
-        return None
-    finally:
-        driver.quit()
\ No newline at end of file
@@ -0,0 +1,149 @@
+import logging
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+
+from crawling.base.chrome_supervisor import BrowserCapReached, max_browsers, quit_driver, record_navigation, \
+    should_recycle
+from crawling.base.webdriver_config import create_driver
+
+logger = logging.getLogger(__name__)
+
+## 미리 띄워둔 Chrome 을 재사용하기 위한 WebDriver 풀
+class WebDriverPool:
+
+    def __init__(self, size: int | None = None, max_pages: int | None = None, checkout_timeout: int = 120,
+                 site: str | None = None, capture_network: bool = False):
+        # 전역 브라우저 한도보다 큰 풀은 다른 사이트의 슬롯까지 모두 점유하므로 한도 이하로 제한
+        self.size = min(max(1, size or int(os.getenv("WEBDRIVER_POOL_SIZE", "2"))), max_browsers())
+        self.max_pages = max(1, max_pages or int(os.getenv("WEBDRIVER_MAX_PAGES", "50")))
+        self.checkout_timeout = checkout_timeout
+        self.site = site
+        self.capture_network = capture_network
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._page_counts: dict[int, int] = {}
+        self._created = 0
+        self._live = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    ## 풀 크기만큼 드라이버 미리 생성
+    def warm_up(self, count: int | None = None):
+        count = min(count or self.size, self.size)
+        drivers = []
+        for _ in range(count):
+            try:
+                driver = self._try_create()
+            except Exception as e:
+                logger.warning(f"[DRIVER_POOL] 드라이버 사전 생성 실패: {e}")
+                break
+            if driver is None:
+                break
+            drivers.append(driver)
+        for driver in drivers:
+            self._idle.put(driver)
+        logger.info(f"[DRIVER_POOL] {len(drivers)}개 드라이버 준비 완료 (최대 {self.size})")
+
+    def _try_create(self) -> webdriver.Chrome | None:
+        with self._lock:
+            if self._closed or self._created >= self.size:
+                return None
+            # 드라이버가 하나도 없는 풀은 다른 사이트가 슬롯을 반납할 때까지 대기 (CHROME_SLOT_TIMEOUT)
+            # 이미 드라이버가 있는 풀은 한도에 걸리면 새로 띄우지 않고 반납되는 드라이버를 기다림
+            block = self._live == 0
+            self._created += 1
+        try:
+            driver = create_driver(self.site, wait=block, capture_network=self.capture_network)
+        except BrowserCapReached:
+            with self._lock:
+                self._created -= 1
+            if block:
+                logger.info(f"[DRIVER_POOL] {self.site} 브라우저 슬롯 대기 중 (다른 사이트가 사용 중)")
+            return None
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+        with self._lock:
+            self._live += 1
+        self._page_counts[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver: webdriver.Chrome):
+        self._page_counts.pop(id(driver), None)
+        with self._lock:
+            self._created -= 1
+            self._live -= 1
+        quit_driver(driver)
+
+    @staticmethod
+    def _is_healthy(driver: webdriver.Chrome) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def checkout(self) -> webdriver.Chrome:
+        deadline = time.monotonic() + self.checkout_timeout
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._try_create()
+                if driver is None:
+                    if not self._closed and self._live == 0:
+                        # 풀에 드라이버가 없으면 시간 초과로 실패하지 않고 다른 사이트가 슬롯을 반납할 때까지 대기
+                        # (대기 시간은 이 풀에 드라이버가 생긴 뒤부터 계산)
+                        deadline = time.monotonic() + self.checkout_timeout
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError("[DRIVER_POOL] 드라이버 대기 시간 초과")
+                    try:
+                        driver = self._idle.get(timeout=min(1.0, remaining))
+                    except queue.Empty:
+                        continue
+
+            if self._is_healthy(driver):
+                return driver
+
+            logger.warning("[DRIVER_POOL] 응답 없는 드라이버 폐기 후 재생성")
+            self._discard(driver)
+
+    def checkin(self, driver: webdriver.Chrome):
+        count = self._page_counts.get(id(driver), 0) + 1
+        self._page_counts[id(driver)] = count
+        record_navigation(driver)
+
+        # N 페이지 이상 사용했거나 메모리 한도를 넘은 드라이버는 재시작
+        if self._closed or count >= self.max_pages or should_recycle(driver):
+            self._discard(driver)
+            return
+        self._idle.put(driver)
+
+    @contextmanager
+    def driver(self):
+        driver = self.checkout()
+        try:
+            yield driver
+        finally:
+            self.checkin(driver)
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+        logger.info("[DRIVER_POOL] 드라이버 풀 종료")
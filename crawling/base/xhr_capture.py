@@ -0,0 +1,77 @@
+import base64
+import json
+import logging
+import time
+from typing import Callable
+
+from selenium import webdriver
+
+from crawling.base.lean_browser import drain_network_events
+
+logger = logging.getLogger(__name__)
+
+## 페이지가 호출하는 API(XHR/fetch) 응답 본문을 CDP 로 가로채 JSON 으로 반환
+## (create_driver(capture_network=True) 로 성능 로그가 켜진 드라이버 필요)
+## url_pattern 이 포함된 응답 중 accept(json) 을 만족하는 첫 번째 응답, 시간 내 없으면 None
+## driver.get 은 페이지 전체 로딩까지 막히므로 CDP Page.navigate 로 이동만 시키고 바로 성능 로그를 확인
+def capture_json_response(driver: webdriver.Chrome,
+                          url: str,
+                          url_pattern: str,
+                          accept: Callable[[dict], bool] = lambda data: True,
+                          timeout: float = 10,
+                          poll: float = 0.05) -> dict | None:
+    # 이전 페이지의 이벤트 제거
+    drain_network_events(driver)
+    # 이번 이동의 loaderId 로 이전 페이지에서 늦게 도착한 응답은 제외
+    loader_id = driver.execute_cdp_cmd("Page.navigate", {"url": url}).get("loaderId")
+
+    candidates: dict[str, str] = {}
+    checked = set()
+    deadline = time.monotonic() + timeout
+
+    try:
+        while time.monotonic() < deadline:
+            for event in drain_network_events(driver):
+                params = event.get("params", {})
+                method = event.get("method")
+
+                if method == "Network.responseReceived":
+                    if loader_id and params.get("loaderId") != loader_id:
+                        continue
+                    response_url = params.get("response", {}).get("url", "")
+                    if url_pattern in response_url:
+                        candidates[params.get("requestId")] = response_url
+                elif method == "Network.loadingFinished":
+                    request_id = params.get("requestId")
+                    if request_id not in candidates or request_id in checked:
+                        continue
+                    checked.add(request_id)
+
+                    data = _response_json(driver, request_id)
+                    if data is not None and accept(data):
+                        return data
+            time.sleep(poll)
+    finally:
+        # 필요한 응답을 얻었거나 시간이 지나면 나머지 리소스 로딩은 중단
+        _stop_loading(driver)
+
+    logger.info(f"[XHR] {timeout:.0f}초 내 {url_pattern} 응답을 찾지 못함: {url}")
+    return None
+
+def _stop_loading(driver: webdriver.Chrome):
+    try:
+        driver.execute_cdp_cmd("Page.stopLoading", {})
+    except Exception as e:
+        logger.debug(f"[XHR] 페이지 로딩 중단 실패: {e}")
+
+def _response_json(driver: webdriver.Chrome, request_id: str) -> dict | None:
+    try:
+        result = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+        body = result.get("body", "")
+        if result.get("base64Encoded"):
+            body = base64.b64decode(body).decode("utf-8", errors="replace")
+        data = json.loads(body)
+        return data if isinstance(data, dict) else None
+    except Exception as e:
+        logger.debug(f"[XHR] 응답 본문 조회 실패 ({request_id}): {e}")
+        return None
@@ -3,6 +3,6 @@ from .kopis import KOPISCrawler
 from .megabox import MEGABOXCrawler
 from .cgv import CGVCrawler
 from .lotte import LOTTECrawler
-from .crawling_util import SSLAdapter
+from infra.http_client import SSLAdapter
 
 __all__ = ["KOFICCrawler", "KOPISCrawler", "MEGABOXCrawler", "CGVCrawler", "LOTTECrawler", "SSLAdapter"]
\ No newline at end of file
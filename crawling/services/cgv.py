@@ -1,170 +1,160 @@
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from typing import List
 
-from bs4 import BeautifulSoup, ResultSet, Tag
+from bs4 import Tag
 
+from crawling.base import parse_pool
 from crawling.base.abstract_crawling_service import AbstractCrawlingService
-from crawling.base.webdriver_config import create_driver, scroll_until_loaded
-from crawling.services.crawling_util import get_detail_data, get_kst_epoch_millis, make_dto
-from infra.elasticsearch_config import get_es_client
-from infra.es_utils import load_all_categories_into_cache, fetch_or_create_category, \
-    search_kofic_index_by_title_and_director
-from method.StringDateConvert import StringDateConvertLongTimeStamp
+from crawling.base.html_parsing import parse_listing
+from crawling.base.render_backend import open_render_session
+from crawling.services.crawling_util import get_detail_bytes, make_dto, listing_fingerprint, reuse_cached_detail, \
+    listing_entry, fetch_listing
+from infra import http_client
+from infra.es_utils import search_kofic_index_by_title_and_director
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
-converter = StringDateConvertLongTimeStamp()
 
-es = get_es_client()
-load_all_categories_into_cache("MOVIE")
 
-def extract_detail_url(element: Tag) -> str:
+def extract_detail_url(element: Tag, detail_prefix: str | None = None) -> str:
     onclick = element.select_one("a.btn_reserve").get("onclick", "")
     match = re.search(r"fnQuickReserve\('(\d+)'", onclick)
     if match:
         code = match.group(1)
-        return f"https://www.cgv.co.kr/movies/detail-view/?midx={code}"
+        return f"{detail_prefix or 'https://www.cgv.co.kr/movies/detail-view/?midx='}{code}"
     logger.warning("[CGV] 예매 코드 추출 실패: %s", onclick)
     return ""
 
-def extract_director_and_actors(soup: BeautifulSoup) -> (List[str], List[str]):
-    spec_block = soup.select_one("div.spec")
-    if not spec_block:
-        return [], []
-
-    directors, actors = [], []
-    dl_children = spec_block.select_one("dl").find_all(["dt", "dd"], recursive=False)
-
-    current_label = None
-    for tag in dl_children:
-        if tag.name == "dt":
-            text = tag.get_text(strip=True).replace(" ", "").replace(":", "").replace("/", "")
-            current_label = text  # ex: "감독", "배우"
-        elif tag.name == "dd" and current_label:
-            if "감독" in current_label:
-                directors.extend([a.text.strip() for a in tag.select("a") if a.text.strip()])
-            elif "배우" in current_label:
-                # 배우가 a 태그에 없을 수도 있음 (텍스트 분리)
-                if tag.select("a"):
-                    actors.extend([a.text.strip() for a in tag.select("a") if a.text.strip()])
-                else:
-                    raw_text = tag.get_text(separator=",").strip()
-                    actors.extend([a.strip() for a in raw_text.split(",") if a.strip()])
-
-    return directors, actors
-
-def extract_genre(soup: BeautifulSoup) -> str:
-    spec_block = soup.select_one("div.spec")
-    if not spec_block:
-        return "기타"
-
-    dt_elements = spec_block.select("dt")
-
-    for dt in dt_elements:
-        if "장르" in dt.text:
-            genre_text = dt.get_text(strip=True).replace("장르 :", "").strip()
-            if genre_text:
-                genre = genre_text.split(",")[0].strip()
-                return genre
-
-    return "기타"
-
-def extract_runtime(soup: BeautifulSoup) -> int:
-    spec_block = soup.select_one("div.spec")
-    if not spec_block:
-        return 0
-
-    dt_elements = spec_block.select("dt")
-    dd_elements = spec_block.select("dd")
-
-    for i, dt in enumerate(dt_elements):
-        if "기본 정보" in dt.text:
-            dd_text = dd_elements[i].text.strip()
-            match = re.search(r"(\d+)\s*분", dd_text)
-            if match:
-                return int(match.group(1))
-    return 0
+## 목록 항목(Tag)을 공통 listing entry 로 변환
+def parse_listing_element(element: Tag, detail_prefix: str | None = None) -> dict | None:
+    title_tag = element.select_one("div.tit_area strong.tit")
+    if not title_tag:
+        return None
 
+    # 개봉일
+    raw_date = element.select_one("span.rel-date").text.strip() if element.select_one("span.rel-date") else ""
+    release_date = raw_date.replace("개봉", "").strip()
 
-class CGVCrawler(AbstractCrawlingService):
-
-    def __init__(self, config):
-        super().__init__(config)
-        self.driver = create_driver()
+    # 포스터
+    img_tag = element.select_one("span.imgbox img")
+    poster = img_tag["src"] if img_tag else ""
 
-    def get_crawling_data(self) -> ResultSet[Tag]:
-        try:
-            url = self.config["url"]
-            self.driver.get(url)
-            scroll_until_loaded(self.driver)
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, "html.parser")
-            return soup.select("div.mm_list_item")
-        finally:
-            self.driver.quit()
-
-    def create_dto(self, element: Tag) -> dict:
-        try:
-            title_tag = element.select_one("div.tit_area strong.tit")
-            if not title_tag:
-                return {}
+    return listing_entry(title_tag.text.strip(), release_date, poster, extract_detail_url(element, detail_prefix))
 
-            #제목
-            title = title_tag.text.strip()
-            detail_url = extract_detail_url(element)
+# URL 의 query 파라미터 하나를 교체
+def with_query_param(url: str, key: str, value) -> str:
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query[key] = str(value)
+    return urlunsplit(parts._replace(query=urlencode(query)))
 
-            detail_soup = get_detail_data(detail_url) if detail_url else None
-
-            # 개봉일
-            raw_date = element.select_one("span.rel-date").text.strip() if element.select_one("span.rel-date") else ""
-            release_date = raw_date.replace("개봉", "").strip()
-            opening_time = converter.string_to_epoch(release_date) if release_date else 0
-            running_time = extract_runtime(detail_soup) if detail_soup else 0
-            epoch_millis = get_kst_epoch_millis()
-            is_delete    = opening_time < epoch_millis
+class CGVCrawler(AbstractCrawlingService):
 
-            # 포스터
-            img_tag = element.select_one("span.imgbox img")
-            poster = img_tag["src"] if img_tag else ""
+    resources = ("categories:MOVIE", "kofic", "movies")
+
+    def get_crawling_data(self) -> List[dict]:
+        return fetch_listing("CGV", self.get_crawling_data_with_api, self.get_crawling_data_with_browser)
+
+    ## 모바일 목록을 브라우저 없이 iPage 단위로 조회 (새 항목이 없으면 종료)
+    def get_crawling_data_with_api(self) -> List[dict]:
+        url = self.config.get("list_api_url") or self.config["url"]
+        max_pages = int(os.getenv("THEATER_LIST_MAX_PAGES", "10"))
+
+        entries, seen = [], set()
+        for page in range(1, max_pages + 1):
+            response = http_client.get(with_query_param(url, "iPage", page))
+            response.raise_for_status()
+            soup = parse_listing(response.text, "CGV")
+
+            added = 0
+            for element in soup.select("div.mm_list_item"):
+                entry = parse_listing_element(element, self.config.get("url_sub"))
+                if not entry:
+                    continue
+                key = entry["detailUrl"] or entry["title"]
+                if key in seen:
+                    continue
+                seen.add(key)
+                entries.append(entry)
+                added += 1
+
+            if not added:
+                break
+        return entries
+
+    ## 설정된 렌더링 백엔드로 목록 페이지를 띄워 조회 (목록을 읽는 동안에만 브라우저 점유)
+    def get_crawling_data_with_browser(self) -> List[dict]:
+        url = self.config["url"]
+        with open_render_session("CGV", size=1) as session:
+            html = session.render(url, scroll=True)
+        if not html:
+            return []
+
+        soup = parse_listing(html, "CGV")
+        entries = (parse_listing_element(element, self.config.get("url_sub")) for element in soup.select("div.mm_list_item"))
+        return [entry for entry in entries if entry]
+
+    ## worker 가 파싱한 필드 dict 로 DTO 필드 구성 (장르 -> 카테고리 참조는 부모 프로세스에서)
+    def parse_detail(self, fields: dict) -> dict:
+        category_level_two = [
+            self.categories.ref(genre, "MOVIE")
+            for genre in fields["genres"]
+            if genre.strip()
+        ]
+
+        return {
+            "plot": fields["plot"],
+            "runningTime": fields["runningTime"],
+            "directors": fields["directors"],
+            "actors": fields["actors"],
+            "categoryLevelTwo": category_level_two
+        }
+
+    def create_dto(self, entry: dict) -> dict:
+        try:
+            title = entry["title"]
+            if not title:
+                return {}
 
-            # 줄거리
-            plot = "정보없음"
-            if detail_soup:
-                plot_tag = detail_soup.find("meta", attrs={"property": "og:description"})
-                if plot_tag:
-                    plot = plot_tag.get("content", "").strip()
+            detail_url = entry["detailUrl"]
+            release_date = entry["releaseDate"]
+            opening_time = entry["openingTime"]
+            poster = entry["poster"]
 
-            genres = extract_genre(detail_soup) if detail_soup else "기타"
-            genre_list = [g.strip() for g in genres.split(",")] if isinstance(genres, str) else []
+            # 예매 링크
+            reservation_link = [None, None, None]  # MEGA BOX, CGV, LOTTE
+            if detail_url:
+                reservation_link[1] = "https://www.cgv.co.kr/movies/detail-view/?midx=" + detail_url.split("=")[-1]
 
-            category_level_two = [
-                fetch_or_create_category(genre, "MOVIE")
-                for genre in genre_list
-                if genre.strip()
-            ]
+            # 목록 정보가 그대로이고 이미 채워진 영화라면 상세 페이지 요청 생략
+            listing_key = detail_url or title
+            fingerprint = listing_fingerprint(title, release_date, poster, detail_url)
+            detail = reuse_cached_detail("CGV", listing_key, fingerprint, title, reservation_link[1])
+            if detail is None:
+                markup = get_detail_bytes(detail_url) if detail_url else None
+                detail = self.parse_detail(parse_pool.parse_detail("CGV", markup))
+                if markup:
+                    self.fetched_listings.append((listing_key, fingerprint))
 
-            # 감독, 배우
-            directors, actors = extract_director_and_actors(detail_soup) if detail_soup else ([], [])
+            directors = detail["directors"]
 
             # 🔍 KOFIC 인덱스 조회 (문자열로)
             kofic_index = search_kofic_index_by_title_and_director(title, directors)
 
-            # 예매 링크
-            reservation_link = [None, None, None]  # MEGA BOX, CGV, LOTTE
-            if detail_url:
-                reservation_link[1] = "https://www.cgv.co.kr/movies/detail-view/?midx=" + detail_url.split("=")[-1]
-
             return make_dto(
                 title=title,
                 opening_time=opening_time,
                 poster=poster,
                 reservation_link=reservation_link,
                 directors=directors,
-                actors=actors,
-                category_level_two=category_level_two,
-                plot=plot,
-                running_time=running_time,
+                actors=detail["actors"],
+                category_level_two=detail["categoryLevelTwo"],
+                plot=detail["plot"],
+                running_time=detail["runningTime"],
                 kofic_index=kofic_index
             )
 
@@ -174,6 +164,11 @@ class CGVCrawler(AbstractCrawlingService):
 
     def crawl(self) -> List[dict]:
         raw = self.get_crawling_data()
-        results = [self.create_dto(item) for item in raw]
+        # 상세 페이지 요청 / ES 조회는 스레드, HTML 파싱은 파싱 프로세스 풀에서 병렬로 처리
+        with parse_pool.parse_session(), \
+                ThreadPoolExecutor(max_workers=int(os.getenv("CGV_MAX_WORKERS", "8"))) as executor:
+            results = list(executor.map(self.create_dto, raw))
+        # 수집한 장르를 한 번에 조회/생성하여 DTO 의 카테고리 채우기
+        self.categories.resolve(results)
         logger.info(f"[CGV] Crawled {len(results)} items")
         return results
\ No newline at end of file
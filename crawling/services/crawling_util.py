@@ -1,65 +1,97 @@
 from datetime import timezone, timedelta, datetime
 
-import requests
-import ssl
+import hashlib
 import logging
-from bs4 import BeautifulSoup
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support import expected_conditions
-from selenium.webdriver.support.wait import WebDriverWait
-from urllib3 import PoolManager
-from requests.adapters import HTTPAdapter
+import os
+import time
+from typing import Callable, List
 
-from crawling.base.webdriver_config import create_driver
-from infra.es_utils import exists_movie_by_kofic_code, exists_movie_by_nm
+from infra import http_client
+from infra.es_utils import exists_movie_by_kofic_code, exists_movie_by_nm, get_cached_movie_by_reservation_link
+from infra.snapshot_store import get_snapshot_store
+from method.StringDateConvert import StringDateConvertLongTimeStamp
 
 logger = logging.getLogger(__name__)
+converter = StringDateConvertLongTimeStamp()
 
-## 셀레니움 연결을 위한 SSLAdapter
-class SSLAdapter(HTTPAdapter):
-    def init_poolmanager(self, *args, **kwargs):
-        ctx = ssl.create_default_context()
-        ctx.set_ciphers("DEFAULT@SECLEVEL=1")  # 핵심
-        self.poolmanager = PoolManager(*args, ssl_context=ctx, **kwargs)
-
-## 셀레니움을 이용한 Detail 주소 접속 
-def get_detail_data(url: str) -> BeautifulSoup | None:
+## 상세 페이지 응답 원문 (디코딩 없이 bytes, 파싱 프로세스 풀로 그대로 전달)
+def get_detail_bytes(url: str, source: str = "CGV") -> bytes | None:
     try:
-        session = requests.Session()
-        session.mount("https://", SSLAdapter())
-
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-        }
-
-        response = session.get(url, timeout=15, headers=headers)
+        response = http_client.cached_get(url, source=source, timeout=15)
         response.raise_for_status()
-        return BeautifulSoup(response.text, "html.parser")
+        return response.content
 
     except Exception as e:
         logger.warning(f"[HTML_UTILS] 상세 페이지 요청 실패: {e}")
         return None
 
-## 접속된 주소의 정보 요청 및 반환
-def get_detail_data_with_selenium(url: str, timeout: int = 10) -> BeautifulSoup:
-    driver = create_driver()
-    try:
-        driver.get(url)
+## 극장 목록 항목 (API / 브라우저 경로 공통 형식)
+def listing_entry(title: str, release_date: str, poster: str, detail_url: str, opening_time: int | None = None) -> dict:
+    if opening_time is None:
+        opening_time = converter.string_to_epoch(release_date) if release_date else 0
+    return {
+        "title": title,
+        "releaseDate": release_date,
+        "openingTime": opening_time,
+        "poster": poster,
+        "detailUrl": detail_url
+    }
+
+## THEATER_LISTING_MODE=api(기본) 면 목록 API 우선, selenium 이면 브라우저로만 조회
+def use_listing_api() -> bool:
+    return os.getenv("THEATER_LISTING_MODE", "api").lower() == "api"
+
+## API 목록 우선 조회, 실패하거나 비어 있으면 브라우저 렌더링 목록으로 대체
+def fetch_listing(source: str, api_fetch: Callable[[], List[dict]], browser_fetch: Callable[[], List[dict]]) -> List[dict]:
+    if use_listing_api():
+        try:
+            started = time.perf_counter()
+            entries = api_fetch()
+            if entries:
+                logger.info(f"[{source}] API 목록 {len(entries)}건 조회 ({time.perf_counter() - started:.2f}s)")
+                return entries
+            logger.warning(f"[{source}] API 목록이 비어 있어 브라우저로 조회")
+        except Exception as e:
+            logger.warning(f"[{source}] API 목록 조회 실패, 브라우저로 조회: {e}")
+
+    return browser_fetch()
+
+## 목록 항목 fingerprint (제목, 개봉일, 포스터, 예매 코드)
+def listing_fingerprint(*parts) -> str:
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+## 상세 정보가 모두 채워져 있는지 확인
+def is_detail_complete(movie: dict) -> bool:
+    plot = (movie.get("plot") or "").strip()
+    return bool(plot and plot != "정보없음"
+                and movie.get("runningTime")
+                and movie.get("directors")
+                and movie.get("categoryLevelTwo"))
+
+## 목록이 바뀌지 않았고 movie-index 에 상세 정보가 채워진 영화면 캐시된 상세 필드 반환
+## 영화는 이 사이트의 예매 링크로 찾음 (KOFIC 매칭 문서는 목록 제목이 아닌 KOFIC movieNm 으로 저장되므로)
+def reuse_cached_detail(source: str, listing_key: str, fingerprint: str, title: str, reservation_link: str) -> dict | None:
+    max_age = float(os.getenv("DETAIL_MAX_AGE_DAYS", "7")) * 86400
+    if max_age <= 0:
+        return None
 
-        # 실제 내용을 담고 있는 React 컨테이너가 로딩될 때까지 대기
-        WebDriverWait(driver, timeout).until(
-            expected_conditions.presence_of_element_located((By.CSS_SELECTOR, "div.movi_tab_info1"))  # 또는 "ul.detail_info2"
-        )
+    entry = get_snapshot_store().get_listing(source, listing_key)
+    if not entry or entry[0] != fingerprint or time.time() - entry[1] > max_age:
+        return None
 
-        # 동적으로 로딩된 div의 innerHTML 가져오기
-        content_element = driver.find_element(By.CSS_SELECTOR, "div.movi_tab_info1")
-        inner_html = content_element.get_attribute("innerHTML")
-        return BeautifulSoup(inner_html, "html.parser")
-    except Exception as e:
-        logger.warning(f"[LOTTE] 상세 페이지 로딩 실패: {e}")
+    movie = get_cached_movie_by_reservation_link(reservation_link)
+    if not movie or not is_detail_complete(movie):
         return None
-    finally:
-        driver.quit()
+
+    logger.info(f"[{source}] 상세 페이지 요청 생략 (캐시 사용): {title}")
+    return {
+        "plot": movie.get("plot"),
+        "runningTime": movie.get("runningTime", 0),
+        "directors": movie.get("directors", []),
+        "actors": movie.get("actors", []),
+        "categoryLevelTwo": movie.get("categoryLevelTwo", [])
+    }
 
 ## KST 기준 현재 시간 epochmills 반환
 def get_kst_epoch_millis() -> int:
@@ -145,4 +177,15 @@ def make_dto(title: str,
                 "__update__": is_update,
                 "__delete__": is_delete
             }
-        
+
+## 저장 직전 최신 영화 캐시 기준으로 update 여부 재계산
+def refresh_update_flag(dto: dict) -> dict:
+    if not dto:
+        return dto
+
+    kofic_code = dto.get("KOFICCode")
+    if kofic_code:
+        dto["__update__"] = exists_movie_by_kofic_code(kofic_code)
+    else:
+        dto["__update__"] = exists_movie_by_nm(dto.get("movieNm"))
+    return dto
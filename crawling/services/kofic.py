@@ -1,42 +1,106 @@
-import requests
 import logging
-from typing import List
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List, Tuple
 from crawling.base.abstract_crawling_service import AbstractCrawlingService
 from method.StringDateConvert import StringDateConvertLongTimeStamp
-from infra.elasticsearch_config import get_es_client
-from infra.es_utils import fetch_or_create_category, exists_kofic_by_kofic_code, load_all_kofic_into_cache, \
-    load_all_categories_into_cache
+from infra import http_client
+from infra.es_utils import exists_kofic_by_kofic_code
+from infra.snapshot_store import get_snapshot_store
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 converter = StringDateConvertLongTimeStamp()
-es = get_es_client()
-
-load_all_categories_into_cache("MOVIE")
-load_all_kofic_into_cache()
 
 global dto
+
+## KOFIC API 키별 일일 호출 한도 관리
+## 사용량은 스냅샷 DB 에 (API 키, KST 날짜) 단위로 누적되므로 같은 날 재실행 / 재시도도 같은 한도를 나눠 씀
+class RequestBudget:
+
+    def __init__(self, limit: int, key: str | None = None, api: str = "KOFIC"):
+        self.limit = limit
+        self.key = key or ""
+        self.api = api
+        self.used = 0  # 이번 실행의 호출 수
+        self._lock = threading.Lock()
+        self._store = None
+        try:
+            self._store = get_snapshot_store()
+            used_today = self._store.get_usage(self.api, self.key, _today())
+            if used_today:
+                logger.info(f"[{self.api}] 오늘 이미 사용한 요청 {used_today}/{self.limit}회")
+        except Exception as e:
+            logger.warning(f"[{self.api}] 요청 사용량 조회 실패, 이번 실행 기준으로만 제한: {e}")
+            self._store = None
+
+    def acquire(self) -> bool:
+        with self._lock:
+            if self._store is not None:
+                try:
+                    if not self._store.try_use(self.api, self.key, _today(), self.limit):
+                        return False
+                    self.used += 1
+                    return True
+                except Exception as e:
+                    logger.warning(f"[{self.api}] 요청 사용량 기록 실패, 이번 실행 기준으로만 제한: {e}")
+                    self._store = None
+
+            if self.used >= self.limit:
+                return False
+            self.used += 1
+            return True
+
+# KOFIC 일일 한도 기준 날짜 (KST)
+def _today() -> str:
+    return datetime.now(timezone(timedelta(hours=9))).strftime("%Y%m%d")
+
 class KOFICCrawler(AbstractCrawlingService):
 
+    resources = ("categories:MOVIE", "kofic")
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self.max_workers = int(os.getenv("KOFIC_MAX_WORKERS", "8"))
+        self.budget = RequestBudget(int(os.getenv("KOFIC_REQUEST_BUDGET", "3000")), key=config.get("params", {}).get("key"))
+
     def get_crawling_data(self) -> List[dict]:
+        page = int(self.config.get("params", {}).get("curPage", "1"))
+        return self.fetch_page(page)[1]
+
+    ## 목록 페이지 조회, (totCnt, movieList) 반환
+    def fetch_page(self, page: int) -> Tuple[int, List[dict]]:
+        if not self.budget.acquire():
+            logger.warning(f"[KOFIC] 요청 한도 초과로 목록 {page} 페이지 조회 생략")
+            return 0, []
+
         url = self.config["url"]
-        params = self.config.get("params", {})
-        response = requests.get(url, params=params)
+        params = {**self.config.get("params", {}), "curPage": str(page)}
+        response = http_client.get(url, params=params)
         response.raise_for_status()
-        return response.json().get("movieListResult", {}).get("movieList", [])
+        result = response.json().get("movieListResult", {})
+        return int(result.get("totCnt", 0) or 0), result.get("movieList", [])
 
     def get_detail_data(self, movie_cd: str) -> dict:
         detail_url = self.config.get("url_sub")
         key = self.config["params"].get("key")
         try:
-            response = requests.get(detail_url, params={"key": key, "movieCd": movie_cd})
+            # 캐시에 없거나 만료된 경우에만 요청 한도 차감
+            response = http_client.cached_get(detail_url, params={"key": key, "movieCd": movie_cd},
+                                              source="KOFIC", allow_network=self.budget.acquire)
             response.raise_for_status()
             return response.json().get("movieInfoResult", {}).get("movieInfo", {})
+        except http_client.NetworkNotAllowed:
+            logger.warning(f"[KOFIC] 요청 한도 초과로 상세 조회 생략: {movie_cd}")
+            return {}
         except Exception as e:
             logger.warning(f"[KOFIC] Detail fetch failed for {movie_cd}: {e}")
             return {}
 
-    def create_dto(self, item: dict) -> dict:
+    def create_dto(self, item: dict, detail_data: dict | None = None) -> dict:
 
         prdt_year_str = item.get("prdtYear", "")
         prdt_year_long = 0 if not prdt_year_str else converter.string_to_epoch(prdt_year_str)
@@ -48,10 +112,11 @@ class KOFICCrawler(AbstractCrawlingService):
 
         genre_str = item.get("genreAlt", "")
         genre_list = [c.strip() for c in genre_str.split(",") if c.strip()]
-        categories = [fetch_or_create_category(genre, "MOVIE") for genre in genre_list if genre]
+        categories = [self.categories.ref(genre, "MOVIE") for genre in genre_list if genre]
         categories = [cat for cat in categories if cat]
 
-        detail_data = self.get_detail_data(item.get("movieCd"))
+        if detail_data is None:
+            detail_data = self.get_detail_data(item.get("movieCd"))
         actors = [d.get("peopleNm", "") for d in detail_data.get("actors", []) if d.get("peopleNm")]
 
         running_time = 0
@@ -75,31 +140,43 @@ class KOFICCrawler(AbstractCrawlingService):
             "__update__": exists_kofic_by_kofic_code(item.get("movieCd"))
         }
 
-    def crawl(self) -> List[dict]:
-        global dto
-        results = []
-        page = 1
-        stop_crawling = False
-
-        while not stop_crawling:
-
-            self.config["params"]["curPage"] = str(page)
-            raw_data = self.get_crawling_data()
-            if not raw_data:
-                break
+    ## 이미 존재하는 KOFICCode 를 만나기 전까지의 항목을 수집, 중단 여부 반환
+    @staticmethod
+    def collect_until_known(raw_data: List[dict], items: List[dict]) -> bool:
+        for item in raw_data:
+            if exists_kofic_by_kofic_code(item.get("movieCd")):
+                logger.info(f"[KOFIC] 이미 존재하는 항목 발견: {item.get('movieNm')}({item.get('movieCd')}). 크롤링 중단.")
+                return True
+            items.append(item)
+        return False
 
-            for item in raw_data:
-                dto = self.create_dto(item)
-
-                if dto.get("__update__"):
-                    logger.info(f"[KOFIC] 이미 존재하는 항목 발견: {dto.get('movieNm')}({dto.get('KOFICCode')}). 크롤링 중단.")
-                    stop_crawling = True
-                    break
-                results.append(dto)
-
-            page += 1
-            if page > 3000:
-                break
-
-        logger.info(f"[KOFIC] Crawled total {len(results)} items across {page} pages")
+    def crawl(self) -> List[dict]:
+        items = []
+        tot_cnt, raw_data = self.fetch_page(1)
+        if not raw_data:
+            return []
+
+        per_page = int(self.config["params"].get("itemPerPage", "100"))
+        total_pages = min(math.ceil(tot_cnt / per_page), 3000)
+        stop_crawling = self.collect_until_known(raw_data, items)
+        page = 2
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            # 목록 페이지는 worker 수만큼 묶어서 병렬 조회하고, 순서대로 중단 조건 검사
+            while not stop_crawling and page <= total_pages:
+                window = range(page, min(page + self.max_workers, total_pages + 1))
+                pages = list(executor.map(lambda p: self.fetch_page(p)[1], window))
+                for raw_data in pages:
+                    if not raw_data or self.collect_until_known(raw_data, items):
+                        stop_crawling = True
+                        break
+                page = window.stop
+
+            # movieInfo 상세 정보 병렬 조회
+            details = list(executor.map(self.get_detail_data, [item.get("movieCd") for item in items]))
+
+        results = [self.create_dto(item, detail) for item, detail in zip(items, details)]
+        # 수집한 장르를 한 번에 조회/생성하여 DTO 의 카테고리 채우기
+        self.categories.resolve(results)
+        logger.info(f"[KOFIC] Crawled total {len(results)} items across {page - 1} pages (API 호출 {self.budget.used}회)")
         return results
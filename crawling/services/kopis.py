@@ -1,22 +1,18 @@
-import requests
-import xmltodict
 import logging
-from typing import List
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import List, Tuple
 from crawling.base.abstract_crawling_service import AbstractCrawlingService
+from crawling.services.kopis_parser import parse_list, parse_detail
 from method.StringDateConvert import StringDateConvertLongTimeStamp
-from infra.elasticsearch_config import get_es_client
-from infra.es_utils import load_all_categories_into_cache, fetch_or_create_category, exists_kopis_by_kopis_code, \
-    load_all_kopis_into_cache
+from infra import http_client
+from infra.es_utils import exists_kopis_by_kopis_code
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 converter = StringDateConvertLongTimeStamp()
 
-es = get_es_client()
-
-load_all_categories_into_cache("PERFORMING_ARTS")
-load_all_kopis_into_cache()
-
 global dto
 
 def split_comma(s: str | None) -> list[str]:
@@ -56,30 +52,43 @@ def get_prf_state_enum(korean: str) -> str | None:
     }
     return mapping.get(korean)
 
+## stdate ~ eddate 를 월 단위 shard 로 분할 (months_ahead 이후 구간은 하나의 shard 로 묶음)
+def build_date_shards(stdate: str, eddate: str, months_ahead: int = 12) -> List[Tuple[str, str]]:
+    start = datetime.strptime(stdate, "%Y%m%d").date()
+    end = datetime.strptime(eddate, "%Y%m%d").date()
+    today = date.today()
+    horizon = date(today.year + (today.month - 1 + months_ahead) // 12, (today.month - 1 + months_ahead) % 12 + 1, 1)
+
+    shards = []
+    cursor = start
+    while cursor <= end and cursor < horizon:
+        next_month = date(cursor.year + cursor.month // 12, cursor.month % 12 + 1, 1)
+        shard_end = min(next_month - timedelta(days=1), end)
+        shards.append((cursor.strftime("%Y%m%d"), shard_end.strftime("%Y%m%d")))
+        cursor = next_month
+
+    if cursor <= end:
+        shards.append((cursor.strftime("%Y%m%d"), end.strftime("%Y%m%d")))
+    return shards
+
 class KOPISCrawler(AbstractCrawlingService):
 
-    def get_crawling_data(self) -> List[dict]:
+    resources = ("categories:PERFORMING_ARTS", "kopis")
+
+    def __init__(self, config: dict):
+        super().__init__(config)
+        self.max_workers = int(os.getenv("KOPIS_MAX_WORKERS", "8"))
+        self.months_ahead = int(os.getenv("KOPIS_SHARD_MONTHS_AHEAD", "12"))
+        # shard 에서 이미 존재하는 항목이 이 수만큼 연속으로 나오면 해당 shard 중단
+        self.known_streak = max(1, int(os.getenv("KOPIS_KNOWN_STREAK", "100")))
+
+    def get_crawling_data(self, params: dict | None = None) -> List[dict]:
         url = self.config["url"]
-        params = self.config.get("params", {})
+        params = params if params is not None else self.config.get("params", {})
         try:
-            response = requests.get(url, params=params)
+            response = http_client.get(url, params=params)
             response.raise_for_status()
-            data = xmltodict.parse(response.text)
-            dbs = data.get("dbs", {})
-
-            # 'dbs'가 dict 형태라면 "db" 키를 추출
-            if isinstance(dbs, dict):
-                db_list = dbs.get("db", [])
-                if isinstance(db_list, dict):
-                    return [db_list]  # 단일 항목이 dict로 올 수 있음
-                elif isinstance(db_list, list):
-                    return db_list
-                else:
-                    logger.warning(f"[KOPIS] Unexpected db format: {type(db_list)}")
-                    return []
-
-            logger.warning(f"[KOPIS] Unexpected 'dbs' type: {type(dbs)}")
-            return []
+            return parse_list(response.content)
 
         except Exception as e:
             logger.warning(f"[KOPIS] Crawling 실패: {e}")
@@ -92,46 +101,30 @@ class KOPISCrawler(AbstractCrawlingService):
             "service": self.config["params"]["service"]
         }
         try:
-            response = requests.get(f"{detail_url}/{mt20id}", params=params)
+            response = http_client.cached_get(f"{detail_url}/{mt20id}", params=params, source="KOPIS")
             response.raise_for_status()
-            data = xmltodict.parse(response.text)
-            return data.get("dbs", {}).get("db", {})
+            return parse_detail(response.content)
         except Exception as e:
             logger.warning(f"[KOPIS] Detail fetch failed for {mt20id}: {e}")
             return {}
 
-    def create_dto(self, item: dict) -> dict:
+    def create_dto(self, item: dict, detail: dict | None = None) -> dict:
 
         mt20id = item.get("mt20id", "")
-        detail = self.get_detail_data(mt20id)
+        if detail is None:
+            detail = self.get_detail_data(mt20id)
 
         # relates
-        relates = []
-        relate_data = detail.get("relates", {}).get("relate")
-        if isinstance(relate_data, list):
-            for r in relate_data:
-                name, url = r.get("relatenm"), r.get("relateurl")
-                if name and url:
-                    relates.append(f"{name} : {url}")
-        elif isinstance(relate_data, dict):
-            name, url = relate_data.get("relatenm"), relate_data.get("relateurl")
-            if name and url:
-                relates.append(f"{name} : {url}")
+        relates = [f"{name} : {url}" for name, url in detail.get("relates", []) if name and url]
 
         # styurls
-        styurls = []
-        styurl_node = detail.get("styurls", {}).get("styurl")
-        if isinstance(styurl_node, str):
-            styurls.append(styurl_node.strip())
-        elif isinstance(styurl_node, list):
-            styurls = [url.strip() for url in styurl_node if isinstance(url, str) and url.strip()]
-
+        styurls = detail.get("styurls", [])
 
         start_date = converter.string_to_epoch(item.get("prfpdfrom", ""))
         end_date = converter.string_to_epoch(item.get("prfpdto", ""))
         runtime = parse_runtime(detail.get("prfruntime", ""))
         genre = item.get("genrenm", "기타").upper()
-        category = fetch_or_create_category(genre, "PERFORMING_ARTS")
+        category = self.categories.ref(genre, "PERFORMING_ARTS")
         dt_raw = detail.get("dtguidance")
         dtguidance = split_comma(dt_raw) if dt_raw else []
 
@@ -157,31 +150,53 @@ class KOPISCrawler(AbstractCrawlingService):
             "__update__": exists_kopis_by_kopis_code(mt20id)
         }
 
-    def crawl(self) -> List[dict]:
-        global dto
-        results = []
+    ## 하나의 기간 shard 를 페이지 순서대로 조회, 이미 존재하는 항목은 건너뛰고 연속으로 known_streak 개 나오면 해당 shard 중단
+    ## (장기 공연은 여러 월 shard 에 함께 나오므로 첫 기존 항목에서 멈추면 그 뒤의 새 항목이 누락됨)
+    def crawl_shard(self, stdate: str, eddate: str) -> List[dict]:
+        items = []
         page = 1
-        stop_crawling = False
-
-        while not stop_crawling:
+        streak = 0
 
-            self.config["params"]["cpage"] = str(page)
-            raw_data = self.get_crawling_data()
+        while page <= 3000:
+            params = {**self.config["params"], "stdate": stdate, "eddate": eddate, "cpage": str(page)}
+            raw_data = self.get_crawling_data(params)
             if not raw_data:
                 break
 
             for item in raw_data:
-                dto = self.create_dto(item)
-
-                if dto.get("__update__"):
-                    logger.info(f"[KOPIS] 이미 존재하는 항목 발견: {dto.get('name')}({dto.get('code')}). 크롤링 중단.")
-                    stop_crawling = True
-                    break
-                results.append(dto)
-
+                if not exists_kopis_by_kopis_code(item.get("mt20id")):
+                    streak = 0
+                    items.append(item)
+                    continue
+
+                streak += 1
+                if streak >= self.known_streak:
+                    logger.info(f"[KOPIS] 이미 존재하는 항목 {streak}개 연속 발견: {item.get('prfnm')}({item.get('mt20id')}). "
+                                f"{stdate}~{eddate} 크롤링 중단.")
+                    return items
             page += 1
-            if page > 3000:
-                break
 
-        logger.info(f"[KOPIS] Crawled total {len(results)} items across {page} pages")
-        return results
\ No newline at end of file
+        return items
+
+    def crawl(self) -> List[dict]:
+        params = self.config["params"]
+        shards = build_date_shards(params["stdate"], params["eddate"], self.months_ahead)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            shard_results = list(executor.map(lambda shard: self.crawl_shard(*shard), shards))
+
+            # 기간이 겹치는 공연은 여러 shard 에 나타나므로 mt20id 기준 중복 제거
+            items = {}
+            for shard_items in shard_results:
+                for item in shard_items:
+                    mt20id = item.get("mt20id")
+                    if mt20id and mt20id not in items:
+                        items[mt20id] = item
+
+            details = list(executor.map(self.get_detail_data, items.keys()))
+
+        results = [self.create_dto(item, detail) for item, detail in zip(items.values(), details)]
+        # 수집한 장르를 한 번에 조회/생성하여 DTO 의 카테고리 채우기
+        self.categories.resolve(results)
+        logger.info(f"[KOPIS] Crawled total {len(results)} items across {len(shards)} shards")
+        return results
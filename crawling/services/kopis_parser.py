@@ -0,0 +1,66 @@
+import io
+import sys
+import time
+from typing import Iterator, List
+from xml.etree import ElementTree
+
+## KOPIS XML 응답을 스트리밍으로 파싱하여 db 단위의 평평한 dict 로 반환
+
+def _text(elem: ElementTree.Element | None) -> str:
+    if elem is None or elem.text is None:
+        return ""
+    return elem.text.strip()
+
+def _flatten(db: ElementTree.Element) -> dict:
+    record = {}
+    for child in db:
+        if child.tag == "relates":
+            # relate 가 1개여도 항상 (relatenm, relateurl) 리스트
+            record["relates"] = [(_text(r.find("relatenm")), _text(r.find("relateurl"))) for r in child]
+        elif child.tag == "styurls":
+            record["styurls"] = [_text(url) for url in child if _text(url)]
+        elif len(child) == 0:
+            record[child.tag] = _text(child)
+    return record
+
+def iter_db_records(source: bytes) -> Iterator[dict]:
+    for _, elem in ElementTree.iterparse(io.BytesIO(source), events=("end",)):
+        if elem.tag == "db":
+            yield _flatten(elem)
+            elem.clear()
+
+## 목록 응답 파싱
+def parse_list(source: bytes) -> List[dict]:
+    return list(iter_db_records(source))
+
+## 상세 응답 파싱 (첫 번째 db 만 사용)
+def parse_detail(source: bytes) -> dict:
+    return next(iter_db_records(source), {})
+
+## 기존 xmltodict 경로와의 파싱 속도 비교
+## 사용법: python -m crawling.services.kopis_parser list.xml detail.xml ...
+def _benchmark(paths: List[str], repeat: int = 200):
+    import xmltodict
+
+    for path in paths:
+        with open(path, "rb") as f:
+            source = f.read()
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            data = xmltodict.parse(source).get("dbs", {}) or {}
+            db = data.get("db", [])
+            if isinstance(db, dict):
+                db = [db]
+        legacy = (time.perf_counter() - started) / repeat
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            parse_list(source)
+        streaming = (time.perf_counter() - started) / repeat
+
+        print(f"{path}: xmltodict {legacy * 1000:.3f}ms / iterparse {streaming * 1000:.3f}ms "
+              f"(x{legacy / streaming if streaming else 0:.2f})")
+
+if __name__ == "__main__":
+    _benchmark(sys.argv[1:])
@@ -1,24 +1,27 @@
+import json
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List
 
-from bs4 import BeautifulSoup, ResultSet, Tag
+from bs4 import Tag
 
+from crawling.base import parse_pool
 from crawling.base.abstract_crawling_service import AbstractCrawlingService
-from crawling.base.webdriver_config import create_driver, scroll_until_loaded
-from crawling.services.crawling_util import get_detail_data_with_selenium, make_dto
-from infra.elasticsearch_config import get_es_client
-from infra.es_utils import load_all_categories_into_cache, fetch_or_create_category, \
-    search_kofic_index_by_title_and_director
+from crawling.base.html_parsing import parse_listing
+from crawling.base.render_backend import open_render_session
+from crawling.services.crawling_util import make_dto, listing_fingerprint, \
+    reuse_cached_detail, listing_entry, fetch_listing
+from infra import http_client
+from infra.es_utils import search_kofic_index_by_title_and_director
 from method.StringDateConvert import StringDateConvertLongTimeStamp
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 converter = StringDateConvertLongTimeStamp()
 
-es = get_es_client()
-load_all_categories_into_cache("MOVIE")
 
 def extract_detail_url(element: Tag) -> str:
     detail_anchor = element.select_one("div.over_box a[href*='MovieDetailView']")
@@ -26,79 +29,6 @@ def extract_detail_url(element: Tag) -> str:
         return detail_anchor.get("href", "")
     return ""
 
-def extract_director_and_actors(soup: BeautifulSoup) -> (List[str], List[str]):
-    info_block = soup.select_one("ul.detail_info2")
-    if not info_block:
-        return [], []
-
-    directors, actors = [], []
-
-    for li in info_block.select("li"):
-        label = li.find("em")
-        value = li.find("span")
-
-        if not label or not value:
-            continue
-
-        label_text = label.get_text(strip=True)
-
-        if "감독" in label_text:
-            # 감독은 a 태그 기준
-            directors = [a.get_text(strip=True) for a in value.select("a") if a.get_text(strip=True)]
-        elif "출연" in label_text:
-            if value.select("a"):
-                actors = [a.get_text(strip=True) for a in value.select("a") if a.get_text(strip=True)]
-            else:
-                raw_text = value.get_text(separator=",").strip()
-                actors = [a.strip() for a in raw_text.split(",") if a.strip()]
-
-    return directors, actors
-
-def extract_genres(soup: BeautifulSoup) -> List[str]:
-    info_block = soup.select_one("ul.detail_info2")
-    if not info_block:
-        return ["기타"]
-
-    for li in info_block.select("li"):
-        label = li.find("em")
-        value = li.find("span")
-
-        if not label or not value:
-            continue
-
-        if "장르" in label.get_text(strip=True):
-            full_text = value.get_text(strip=True)
-
-            # 슬래시(/) 기준으로 국가 등 뒷부분 제거
-            genre_text = full_text.split("/")[0].strip()
-
-            # 쉼표로 장르 분할
-            genres = [g.strip() for g in genre_text.split(",") if g.strip()]
-            return genres if genres else ["기타"]
-
-    return ["기타"]
-
-def extract_runtime(soup: BeautifulSoup) -> int:
-    info_block = soup.select_one("ul.detail_info2")
-    if not info_block:
-        return 0
-
-    for li in info_block.select("li"):
-        label = li.find("em")
-        value = li.find("span")
-
-        if not label or not value:
-            continue
-
-        # 런타임도 장르 라인에 포함되어 있을 수 있으므로 같이 체크
-        if "장르" in label.get_text(strip=True):
-            text = value.get_text(strip=True)
-            match = re.search(r"(\d+)\s*분", text)
-            if match:
-                return int(match.group(1))
-
-    return 0
-
 def extract_release_date_and_opening_time(element: Tag, converter) -> (str, int):
     d_day_span = element.select_one("span.remain_info")
     if not d_day_span:
@@ -116,77 +46,218 @@ def extract_release_date_and_opening_time(element: Tag, converter) -> (str, int)
 
     return release_date_str, opening_time
 
-class LOTTECrawler(AbstractCrawlingService):
+## 목록 항목(Tag)을 공통 listing entry 로 변환
+def parse_listing_element(element: Tag) -> dict | None:
+    title_tag = element.select_one("div.btm_info strong.tit_info")
+    if not title_tag:
+        return None
 
-    def __init__(self, config):
-        super().__init__(config)
-        self.driver = create_driver()
+    # 개봉일
+    release_date, opening_time = extract_release_date_and_opening_time(element, converter)
 
-    def get_crawling_data(self) -> ResultSet[Tag]:
-        try:
-            url = self.config["url"]
-            self.driver.get(url)
-            scroll_until_loaded(self.driver)
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, "html.parser")
-            return soup.select(".screen_add_box")
-        finally:
-            self.driver.quit()
-
-    def create_dto(self, element: Tag) -> dict:
-        try:
-            title_tag = element.select_one("div.btm_info strong.tit_info")
-            if not title_tag:
-                return {}
+    # 포스터
+    img_tag = element.select_one("img")
+    poster = img_tag["src"] if img_tag and img_tag.has_attr("src") else ""
 
-            #제목
-            title = title_tag.text.strip()
-            detail_url = extract_detail_url(element)
+    return listing_entry(title_tag.text.strip(), release_date, poster, extract_detail_url(element), opening_time)
 
-            detail_soup = get_detail_data_with_selenium(detail_url) if detail_url else None
-            # 개봉일
-            raw_date = element.select_one("span.remain_info").text.strip() if element.select_one("span.remain_info") else ""
-            release_date, opening_time = extract_release_date_and_opening_time(element, converter)
-            running_time = extract_runtime(detail_soup) if detail_soup else 0
+# "2025-08-06 ..." -> "2025.08.06"
+def normalize_release_date(raw: str | None) -> str:
+    match = re.match(r"(\d{4})[-.](\d{2})[-.](\d{2})", raw or "")
+    return ".".join(match.groups()) if match else ""
 
-            # 포스터
-            img_tag = element.select_one("img")
-            poster = img_tag["src"] if img_tag and img_tag.has_attr("src") else ""
+# 상세 API 응답의 출연진 항목을 (감독, 배우) 로 분류
+def extract_director_and_actors_from_json(castings: List[dict]) -> (List[str], List[str]):
+    directors, actors = [], []
+    for casting in castings:
+        role = casting.get("Role") or casting.get("RoleNameKR") or ""
+        name = (casting.get("StaffName") or casting.get("StaffNameKR") or "").strip()
+        if not name:
+            continue
+        if "감독" in role:
+            directors.append(name)
+        elif "배우" in role or "출연" in role:
+            actors.append(name)
+    return directors, actors
 
-            # 줄거리
-            plot = "정보없음"
-            if detail_soup:
-                plot_tag = detail_soup.find("meta", attrs={"property": "og:description"})
-                if plot_tag:
-                    plot = plot_tag.get("content", "").strip()
+## LOTTE_DETAIL_BACKEND=xhr(기본) 면 상세 API 응답 캡처, dom 이면 렌더링된 DOM 파싱
+def use_xhr_detail() -> bool:
+    return os.getenv("LOTTE_DETAIL_BACKEND", "xhr").lower() == "xhr"
 
-            genres = extract_genres(detail_soup) if detail_soup else ["기타"]
-            category_level_two = [
-                fetch_or_create_category(genre, "MOVIE") for genre in genres
-                if genre
-            ]
+class LOTTECrawler(AbstractCrawlingService):
 
-            # 감독, 배우
-            directors, actors = extract_director_and_actors(detail_soup) if detail_soup else ([], [])
+    resources = ("categories:MOVIE", "kofic", "movies")
 
-            # 🔍 KOFIC 인덱스 조회 (문자열로)
-            kofic_index = search_kofic_index_by_title_and_director(title, directors)
+    def __init__(self, config):
+        super().__init__(config)
+        self.session = None
+
+    def get_crawling_data(self) -> List[dict]:
+        return fetch_listing("LOTTE", self.get_crawling_data_with_api, self.get_crawling_data_with_browser)
+
+    ## 영화 목록 XHR (MovieData.aspx) 을 페이지 단위로 조회
+    def get_crawling_data_with_api(self) -> List[dict]:
+        api_url = self.config.get("list_api_url")
+        if not api_url:
+            return []
+
+        detail_prefix = self.config.get("url_sub") or "https://www.lottecinema.co.kr/NLCHS/Movie/MovieDetailView?movie="
+        page_size = int(os.getenv("THEATER_LIST_PAGE_SIZE", "100"))
+        max_pages = int(os.getenv("THEATER_LIST_MAX_PAGES", "10"))
+
+        entries = []
+        for page in range(1, max_pages + 1):
+            param_list = {
+                "MethodName": self.config.get("list_api_method") or "GetMoviesToBe",
+                "channelType": "HO",
+                "osType": "W",
+                "osVersion": "",
+                "multiLanguageID": "KR",
+                "division": 1,
+                "moviePlayYN": "N",
+                "orderType": "5",
+                "blockSize": page_size,
+                "pageNo": page,
+                "memberOnNo": ""
+            }
+            response = http_client.post(api_url, data={"paramList": json.dumps(param_list)})
+            response.raise_for_status()
+            movies = response.json().get("Movies") or {}
+            items = movies.get("Items") or []
+
+            for item in items:
+                code = str(item.get("RepresentationMovieCode") or "")
+                title = (item.get("MovieNameKR") or "").strip()
+                # 광고 슬롯 등 영화가 아닌 항목 제외
+                if not title or not code.isdigit():
+                    continue
+                entries.append(listing_entry(
+                    title,
+                    normalize_release_date(item.get("ReleaseDate")),
+                    item.get("PosterURL") or "",
+                    f"{detail_prefix}{code}"
+                ))
+
+            total = int(movies.get("ItemCount") or 0)
+            if len(items) < page_size or (total and page * page_size >= total):
+                break
+        return entries
+
+    ## 설정된 렌더링 백엔드로 목록 페이지를 띄워 조회 (목록을 읽는 동안에만 브라우저 점유)
+    def get_crawling_data_with_browser(self) -> List[dict]:
+        url = self.config["url"]
+        with open_render_session("LOTTE", size=1) as session:
+            html = session.render(url, scroll=True)
+        if not html:
+            return []
+
+        soup = parse_listing(html, "LOTTE")
+        entries = (parse_listing_element(element) for element in soup.select(".screen_add_box"))
+        return [entry for entry in entries if entry]
+
+    ## worker 가 파싱한 필드 dict 로 DTO 필드 구성 (장르 -> 카테고리 참조는 부모 프로세스에서)
+    def parse_detail(self, fields: dict) -> dict:
+        category_level_two = [
+            self.categories.ref(genre, "MOVIE")
+            for genre in fields["genres"]
+            if genre.strip()
+        ]
+
+        return {
+            "plot": fields["plot"],
+            "runningTime": fields["runningTime"],
+            "directors": fields["directors"],
+            "actors": fields["actors"],
+            "categoryLevelTwo": category_level_two
+        }
+
+    ## 상세 API(JSON) 응답에서 DTO 에 필요한 필드 추출 (감독 / 러닝타임이 모두 없으면 None)
+    def parse_detail_json(self, data: dict) -> dict | None:
+        movie = data.get("Movie") or {}
+        if isinstance(movie, list):
+            movie = movie[0] if movie else {}
+
+        running_time = int(movie.get("PlayTime") or 0)
+        castings = (data.get("Casting") or {}).get("Items") or []
+        directors, actors = extract_director_and_actors_from_json(castings)
+        if not directors and not running_time:
+            return None
+
+        genres = [
+            movie.get(key).strip()
+            for key in ("MovieGenreNameKR", "MovieGenreNameKR2", "MovieGenreNameKR3")
+            if (movie.get(key) or "").strip()
+        ] or ["기타"]
+
+        plot = (movie.get("Synopsis") or movie.get("SynopsisKR") or "").strip() or "정보없음"
+
+        return {
+            "plot": plot,
+            "runningTime": running_time,
+            "directors": directors,
+            "actors": actors,
+            "categoryLevelTwo": [self.categories.ref(genre, "MOVIE") for genre in genres]
+        }
+
+    ## 상세 API 응답 캡처 우선, 실패하면 렌더링된 DOM 파싱 (둘 다 실패하면 None)
+    def fetch_detail(self, detail_url: str) -> dict | None:
+        if use_xhr_detail():
+            data = self.session.capture_json(
+                detail_url,
+                os.getenv("LOTTE_DETAIL_XHR_PATTERN", "MovieData.aspx"),
+                accept=lambda body: "Movie" in body
+            )
+            detail = self.parse_detail_json(data) if data else None
+            if detail is not None:
+                return detail
+            logger.info(f"[LOTTE] 상세 API 응답을 사용할 수 없어 DOM 으로 조회: {detail_url}")
+
+        # 실제 내용을 담고 있는 React 컨테이너가 로딩될 때까지 대기
+        html = self.session.render(detail_url, wait_selector="div.movi_tab_info1")
+        return self.parse_detail(parse_pool.parse_detail("LOTTE", html)) if html else None
+
+    def create_dto(self, entry: dict) -> dict:
+        try:
+            title = entry["title"]
+            if not title:
+                return {}
+
+            detail_url = entry["detailUrl"]
+            release_date = entry["releaseDate"]
+            opening_time = entry["openingTime"]
+            poster = entry["poster"]
 
             # 예매 링크
             reservation_link = [None, None, None]  # MEGA BOX, CGV, LOTTE
             if detail_url:
                 reservation_link[2] = detail_url
 
+            # 목록 정보가 그대로이고 이미 채워진 영화라면 상세 페이지 요청 생략
+            listing_key = detail_url or title
+            fingerprint = listing_fingerprint(title, release_date, poster, detail_url)
+            detail = reuse_cached_detail("LOTTE", listing_key, fingerprint, title, reservation_link[2])
+            if detail is None:
+                detail = self.fetch_detail(detail_url) if detail_url else None
+                if detail is not None:
+                    self.fetched_listings.append((listing_key, fingerprint))
+                else:
+                    detail = self.parse_detail(parse_pool.parse_detail("LOTTE", None))
+
+            directors = detail["directors"]
+
+            # 🔍 KOFIC 인덱스 조회 (문자열로)
+            kofic_index = search_kofic_index_by_title_and_director(title, directors)
+
             return make_dto(
                 title=title,
                 opening_time=opening_time,
                 poster=poster,
                 reservation_link=reservation_link,
                 directors=directors,
-                actors=actors,
-                category_level_two=category_level_two,
-                plot=plot,
-                running_time=running_time,
+                actors=detail["actors"],
+                category_level_two=detail["categoryLevelTwo"],
+                plot=detail["plot"],
+                running_time=detail["runningTime"],
                 kofic_index=kofic_index
             )
 
@@ -196,6 +267,15 @@ class LOTTECrawler(AbstractCrawlingService):
 
     def crawl(self) -> List[dict]:
         raw = self.get_crawling_data()
-        results = [self.create_dto(item) for item in raw]
+
+        # 상세 페이지는 렌더링 세션(드라이버 풀 / 브라우저 context)을 공유하며 병렬로 조회, 파싱은 파싱 프로세스 풀에서 처리
+        with parse_pool.parse_session(), open_render_session("LOTTE", capture_network=use_xhr_detail()) as session:
+            self.session = session
+            with ThreadPoolExecutor(max_workers=session.workers) as executor:
+                results = list(executor.map(self.create_dto, raw))
+            self.session = None
+
+        # 수집한 장르를 한 번에 조회/생성하여 DTO 의 카테고리 채우기
+        self.categories.resolve(results)
         logger.info(f"[LOTTE] Crawled {len(results)} items")
         return results
\ No newline at end of file
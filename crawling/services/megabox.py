@@ -1,23 +1,22 @@
 import logging
-import re
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
-from bs4 import BeautifulSoup, ResultSet, Tag
+from bs4 import Tag
 
+from crawling.base import parse_pool
 from crawling.base.abstract_crawling_service import AbstractCrawlingService
-from crawling.base.webdriver_config import create_driver, click_until_disappear, get_detail_data_with_selenium
-from crawling.services.crawling_util import make_dto
-from infra.elasticsearch_config import get_es_client
-from infra.es_utils import load_all_categories_into_cache, fetch_or_create_category, \
-    search_kofic_index_by_title_and_director
-from method.StringDateConvert import StringDateConvertLongTimeStamp
+from crawling.base.html_parsing import parse_listing
+from crawling.base.render_backend import open_render_session
+from crawling.services.crawling_util import make_dto, listing_fingerprint, reuse_cached_detail, \
+    listing_entry, fetch_listing
+from infra import http_client
+from infra.es_utils import search_kofic_index_by_title_and_director
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
-converter = StringDateConvertLongTimeStamp()
 
-es = get_es_client()
-load_all_categories_into_cache("MOVIE")
 
 def extract_detail_url(element: Tag) -> str:
     reservation_element = element.select_one("a.movieBtn")
@@ -27,134 +26,144 @@ def extract_detail_url(element: Tag) -> str:
     link = "https://www.megabox.co.kr/movie-detail?rpstMovieNo=" + reservation_element.get("data-no", "")
     return link
 
-def extract_director_and_actors(soup: BeautifulSoup) -> (List[str], List[str]):
+## 목록 항목(Tag)을 공통 listing entry 로 변환
+def parse_listing_element(element: Tag) -> dict | None:
+    title_tag = element.select_one("div.tit-area > p.tit")
+    if not title_tag:
+        return None
 
-    info_block = soup.select_one("div.movie-info.infoContent")
-    if not info_block:
-        return [], []
+    # 개봉일
+    raw_date = element.select_one("div.rate-date > span.date").text.strip() if element.select_one("div.rate-date > span.date") else ""
+    release_date = raw_date.replace("개봉일", "").strip()
 
-    directors, actors = [], []
+    # 포스터
+    img_tag = element.select_one("img")
+    poster = img_tag["src"] if img_tag else ""
 
-    # 1. 감독 추출
-    director_p = info_block.find("p", string=re.compile(r"^\s*감독"))
-    if director_p:
-        text = director_p.get_text(strip=True)
-        text = re.sub(r"^감독\s*[:：]?\s*", "", text)
-        directors = [d.strip() for d in text.split(",") if d.strip()]
-
-    # 2. 출연진 추출
-    actor_p = info_block.find("p", string=re.compile(r"^\s*출연진"))
-    if actor_p:
-        text = actor_p.get_text(strip=True)
-        text = re.sub(r"^출연진\s*[:：]?\s*", "", text)
-        actors = [a.strip() for a in text.split(",") if a.strip()]
-
-    return directors, actors
-
-def extract_genre(soup: BeautifulSoup) -> str:
-    info_block = soup.select_one("div.movie-info.infoContent")
-    if not info_block:
-        return "기타"
-
-    genre_p = info_block.find("p", string=lambda text: text and "장르" in text)
-    if genre_p:
-        text = genre_p.get_text(strip=True)
-        parts = text.replace("장르", "").replace(":", "").strip().split("/")
-        if parts:
-            return parts[0].strip()
-
-    return "기타"
-
-def extract_runtime(soup: BeautifulSoup) -> int:
-    info_block = soup.select_one("div.movie-info.infoContent")
-    if not info_block:
-        return 0
-
-    genre_p = info_block.find("p", string=lambda text: text and "장르" in text)
-    if genre_p:
-        text = genre_p.get_text(strip=True)
-        match = re.search(r"(\d+)\s*분", text)
-        if match:
-            return int(match.group(1))
-
-    return 0
+    return listing_entry(title_tag.text.strip(), release_date, poster, extract_detail_url(element))
 
 class MEGABOXCrawler(AbstractCrawlingService):
 
+    resources = ("categories:MOVIE", "kofic", "movies")
+
     def __init__(self, config):
         super().__init__(config)
-        self.driver = create_driver()
-
-    def get_crawling_data(self) -> ResultSet[Tag]:
+        self.session = None
+
+    def get_crawling_data(self) -> List[dict]:
+        return fetch_listing("MEGABOX", self.get_crawling_data_with_api, self.get_crawling_data_with_browser)
+
+    ## 영화 목록 XHR (selectMovieList.do) 을 페이지 단위로 조회
+    def get_crawling_data_with_api(self) -> List[dict]:
+        api_url = self.config.get("list_api_url")
+        if not api_url:
+            return []
+
+        detail_prefix = self.config.get("url_sub") or "https://www.megabox.co.kr/movie-detail?rpstMovieNo="
+        page_size = int(os.getenv("THEATER_LIST_PAGE_SIZE", "100"))
+        max_pages = int(os.getenv("THEATER_LIST_MAX_PAGES", "10"))
+
+        entries = []
+        for page in range(1, max_pages + 1):
+            payload = {
+                "currentPage": str(page),
+                "recordCountPerPage": str(page_size),
+                "pageType": "rfilmDe",
+                "ibxMovieNmSearch": "",
+                "onairYn": self.config.get("list_api_onair") or "MSC02",
+                "specialType": "",
+                "specialYn": "N"
+            }
+            response = http_client.post(api_url, json=payload)
+            response.raise_for_status()
+            movies = response.json().get("movieList") or []
+
+            for movie in movies:
+                code = movie.get("rpstMovieNo") or movie.get("movieNo") or ""
+                poster = movie.get("imgPathNm") or ""
+                if poster.startswith("/"):
+                    poster = "https://img.megabox.co.kr" + poster
+                entries.append(listing_entry(
+                    (movie.get("movieNm") or "").strip(),
+                    (movie.get("rfilmDe") or "").strip(),
+                    poster,
+                    f"{detail_prefix}{code}" if code else ""
+                ))
+
+            total = int(movies[0].get("totCnt") or 0) if movies else 0
+            if not movies or len(entries) >= total:
+                break
+        return entries
+
+    ## 설정된 렌더링 백엔드로 목록 페이지를 띄워 조회 (목록을 읽는 동안에만 브라우저 점유)
+    def get_crawling_data_with_browser(self) -> List[dict]:
+        url = self.config["url"]
+        with open_render_session("MEGABOX", size=1) as session:
+            html = session.render(url, click_selector=".btn-more")
+        if not html:
+            return []
+
+        soup = parse_listing(html, "MEGABOX")
+        entries = (parse_listing_element(element) for element in soup.select("ol#movieList li"))
+        return [entry for entry in entries if entry]
+
+    ## worker 가 파싱한 필드 dict 로 DTO 필드 구성 (장르 -> 카테고리 참조는 부모 프로세스에서)
+    def parse_detail(self, fields: dict) -> dict:
+        category_level_two = [
+            self.categories.ref(genre, "MOVIE")
+            for genre in fields["genres"]
+            if genre.strip()
+        ]
+
+        return {
+            "plot": fields["plot"],
+            "runningTime": fields["runningTime"],
+            "directors": fields["directors"],
+            "actors": fields["actors"],
+            "categoryLevelTwo": category_level_two
+        }
+
+    def create_dto(self, entry: dict) -> dict:
         try:
-            url = self.config["url"]
-            self.driver.get(url)
-            click_until_disappear(self.driver, ".btn-more")
-            html = self.driver.page_source
-            soup = BeautifulSoup(html, "html.parser")
-            return soup.select("ol#movieList li")
-        finally:
-            self.driver.quit()
-
-    def create_dto(self, element: Tag) -> dict:
-        try:
-            title_tag = element.select_one("div.tit-area > p.tit")
-            if not title_tag:
+            title = entry["title"]
+            if not title:
                 return {}
 
-            #제목
-            title = title_tag.text.strip()
-            detail_url = extract_detail_url(element)
-
-            detail_soup = get_detail_data_with_selenium(detail_url) if detail_url else None
-
-            # 개봉일
-            raw_date = element.select_one("div.rate-date > span.date").text.strip() if element.select_one("div.rate-date > span.date") else ""
-            release_date = raw_date.replace("개봉일", "").strip()
-            opening_time = converter.string_to_epoch(release_date) if release_date else 0
-            running_time = extract_runtime(detail_soup) if detail_soup else 0
+            detail_url = entry["detailUrl"]
+            release_date = entry["releaseDate"]
+            opening_time = entry["openingTime"]
+            poster = entry["poster"]
 
-            # 포스터
-            img_tag = element.select_one("img")
-            poster = img_tag["src"] if img_tag else ""
-
-            # 줄거리
-            plot = "정보없음"
-            if detail_soup:
-                plot_tag = detail_soup.find("meta", attrs={"property": "og:description"})
-                if plot_tag:
-                    plot = plot_tag.get("content", "").strip()
-
-            genres = extract_genre(detail_soup) if detail_soup else "기타"
-            genre_list = [g.strip() for g in genres.split(",")] if isinstance(genres, str) else []
+            # 예매 링크
+            reservation_link = [None, None, None]  # MEGA BOX, CGV, LOTTE
+            if detail_url:
+                reservation_link[0] = detail_url
 
-            category_level_two = [
-                fetch_or_create_category(genre, "MOVIE")
-                for genre in genre_list
-                if genre.strip()
-            ]
+            # 목록 정보가 그대로이고 이미 채워진 영화라면 상세 페이지 요청 생략
+            listing_key = detail_url or title
+            fingerprint = listing_fingerprint(title, release_date, poster, detail_url)
+            detail = reuse_cached_detail("MEGABOX", listing_key, fingerprint, title, reservation_link[0])
+            if detail is None:
+                html = self.session.render(detail_url) if detail_url else None
+                detail = self.parse_detail(parse_pool.parse_detail("MEGABOX", html))
+                if html:
+                    self.fetched_listings.append((listing_key, fingerprint))
 
-            # 감독, 배우
-            directors, actors = extract_director_and_actors(detail_soup) if detail_soup else ([], [])
+            directors = detail["directors"]
 
             # 🔍 KOFIC 인덱스 조회 (문자열로)
             kofic_index = search_kofic_index_by_title_and_director(title, directors)
 
-            # 예매 링크
-            reservation_link = [None, None, None]  # MEGA BOX, CGV, LOTTE
-            if detail_url:
-                reservation_link[0] = detail_url
-
             return make_dto(
                 title=title,
                 opening_time=opening_time,
                 poster=poster,
                 reservation_link=reservation_link,
                 directors=directors,
-                actors=actors,
-                category_level_two=category_level_two,
-                plot=plot,
-                running_time=running_time,
+                actors=detail["actors"],
+                category_level_two=detail["categoryLevelTwo"],
+                plot=detail["plot"],
+                running_time=detail["runningTime"],
                 kofic_index=kofic_index
             )
 
@@ -164,6 +173,15 @@ class MEGABOXCrawler(AbstractCrawlingService):
 
     def crawl(self) -> List[dict]:
         raw = self.get_crawling_data()
-        results = [self.create_dto(item) for item in raw]
+
+        # 상세 페이지는 렌더링 세션(드라이버 풀 / 브라우저 context)을 공유하며 병렬로 조회, 파싱은 파싱 프로세스 풀에서 처리
+        with parse_pool.parse_session(), open_render_session("MEGABOX") as session:
+            self.session = session
+            with ThreadPoolExecutor(max_workers=session.workers) as executor:
+                results = list(executor.map(self.create_dto, raw))
+            self.session = None
+
+        # 수집한 장르를 한 번에 조회/생성하여 DTO 의 카테고리 채우기
+        self.categories.resolve(results)
         logger.info(f"[MEGABOX] Crawled {len(results)} items")
         return results
\ No newline at end of file
@@ -3,6 +3,8 @@
 import requests
 import os
 
+from infra import http_client
+
 def send_discord_message(content: str):
     webhook_url = os.getenv("DISCORD_WEBHOOK_URL")
     if not webhook_url:
@@ -14,7 +16,7 @@ def send_discord_message(content: str):
     }
 
     try:
-        response = requests.post(webhook_url, json=data)
+        response = http_client.post(webhook_url, json=data)
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print("❌ Discord 전송 실패:", e)
@@ -3,15 +3,43 @@ load_dotenv()
 
 from elasticsearch import Elasticsearch
 import os
+import threading
 
+_es_client: Elasticsearch | None = None
+_client_lock = threading.Lock()
+
+def _client_options() -> dict:
+    return {
+        "verify_certs": True,
+        "ssl_show_warn": False,
+        "request_timeout": 60,
+        "http_compress": os.getenv("ES_HTTP_COMPRESS", "false").lower() == "true",
+        "headers": {"X-Elastic-Product": "Elasticsearch"},
+        # 노드별 커넥션 풀 크기 (keep-alive 유지)
+        "maxsize": int(os.getenv("ES_MAXSIZE", "25")),
+        # Bonsai 는 프록시 뒤에 있으므로 sniffing 사용 안 함
+        "sniff_on_start": False,
+        "sniff_on_connection_fail": False,
+        "sniffer_timeout": None
+    }
+
+## 프로세스 전체에서 공유하는 Elasticsearch 클라이언트 (최초 호출 시 생성)
 def get_es_client():
-    es = Elasticsearch(
-        os.getenv("BONSAI_URL"),
-        verify_certs=True,
-        ssl_show_warn=False,
-        request_timeout=60,
-        headers={"X-Elastic-Product": "Elasticsearch"}
-    )
-    # 👇 이 줄이 핵심: 검증 로직 강제로 통과시킴
-    es.transport._verified_elasticsearch = True
-    return es
+    global _es_client
+
+    if _es_client is None:
+        with _client_lock:
+            if _es_client is None:
+                es = Elasticsearch(os.getenv("BONSAI_URL"), **_client_options())
+                # 👇 이 줄이 핵심: 검증 로직 강제로 통과시킴
+                es.transport._verified_elasticsearch = True
+                _es_client = es
+    return _es_client
+
+def close_es_client():
+    global _es_client
+
+    with _client_lock:
+        if _es_client is not None:
+            _es_client.close()
+            _es_client = None
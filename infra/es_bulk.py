@@ -0,0 +1,86 @@
+import logging
+import os
+import time
+from typing import List, Tuple
+
+from elasticsearch.helpers import parallel_bulk, streaming_bulk
+
+from infra.elasticsearch_config import get_es_client
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대상 상태 코드 (Bonsai 요청 한도 초과 / 일시적 장애)
+RETRYABLE_STATUS = {429, 503}
+REFRESH_POLICIES = {"none", "end", "wait_for"}
+
+## 문서 수 / 바이트 단위로 나누어 병렬 전송하고, 거절된 항목만 재시도하는 bulk writer
+class BulkWriter:
+
+    def __init__(self,
+                 es=None,
+                 chunk_size: int | None = None,
+                 max_chunk_bytes: int | None = None,
+                 thread_count: int | None = None,
+                 max_retries: int | None = None,
+                 initial_backoff: float | None = None,
+                 max_backoff: float | None = None,
+                 refresh_policy: str | None = None):
+        self.es = es or get_es_client()
+        self.chunk_size = chunk_size or int(os.getenv("ES_BULK_CHUNK_SIZE", "500"))
+        self.max_chunk_bytes = max_chunk_bytes or int(os.getenv("ES_BULK_MAX_BYTES", str(5 * 1024 * 1024)))
+        self.thread_count = thread_count or int(os.getenv("ES_BULK_THREADS", "4"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("ES_BULK_MAX_RETRIES", "5"))
+        self.initial_backoff = initial_backoff or float(os.getenv("ES_BULK_INITIAL_BACKOFF", "2"))
+        self.max_backoff = max_backoff or float(os.getenv("ES_BULK_MAX_BACKOFF", "60"))
+        self.refresh_policy = (refresh_policy or os.getenv("ES_REFRESH_POLICY", "end")).lower()
+
+        if self.refresh_policy not in REFRESH_POLICIES:
+            raise ValueError(f"❌ [ES] 지원하지 않는 refresh 정책: {self.refresh_policy}")
+
+    def _send(self, actions: list):
+        kwargs = {
+            "chunk_size": self.chunk_size,
+            "max_chunk_bytes": self.max_chunk_bytes,
+            "raise_on_error": False,
+            "raise_on_exception": False
+        }
+        if self.refresh_policy == "wait_for":
+            kwargs["refresh"] = "wait_for"
+
+        if self.thread_count > 1:
+            return parallel_bulk(self.es, actions, thread_count=self.thread_count, **kwargs)
+        return streaming_bulk(self.es, actions, **kwargs)
+
+    ## (성공 수, 실패 수) 반환
+    def write(self, index: str, actions: list) -> Tuple[int, int]:
+        success, failed = 0, 0
+        pending = list(actions)
+        attempt = 0
+
+        while pending:
+            retry: List[dict] = []
+            for action, (ok, item) in zip(pending, self._send(pending)):
+                if ok:
+                    success += 1
+                    continue
+
+                info = next(iter(item.values()), {}) if isinstance(item, dict) else {}
+                status = info.get("status")
+                if status in RETRYABLE_STATUS and attempt < self.max_retries:
+                    retry.append(action)
+                else:
+                    failed += 1
+                    logger.warning(f"[ES] bulk 항목 실패 ({status}): {info.get('_id')} {info.get('error')}")
+
+            if not retry:
+                break
+
+            backoff = min(self.max_backoff, self.initial_backoff * (2 ** attempt))
+            attempt += 1
+            logger.info(f"[ES] 거절된 {len(retry)}건 {backoff:.0f}초 후 재시도 ({attempt}/{self.max_retries})")
+            time.sleep(backoff)
+            pending = retry
+
+        if self.refresh_policy == "end" and index:
+            self.es.indices.refresh(index=index)
+        return success, failed
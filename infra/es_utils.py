@@ -1,21 +1,29 @@
 import logging
+import os
+import threading
 from dotenv import load_dotenv
-from elasticsearch.helpers import bulk
 from infra.elasticsearch_config import get_es_client
-from typing import Dict, Tuple
+from infra.es_bulk import BulkWriter
+from infra.title_matcher import TitleMatcher, normalize_title
+from typing import Dict, Iterable, List, Tuple
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 category_cache: Dict[Tuple[str, str], Dict[str, str]] = {}
 _cached_movies_by_kofic_code: Dict[str, dict] = {}
 _cached_movies_by_title: Dict[str, dict] = {}
+_cached_movies_by_reservation_link: Dict[str, dict] = {}
 _cached_kofic_by_kofic_code: Dict[str, dict] = {}
 _cached_kopis_by_kopis_code: Dict[str, dict] = {}
+_kofic_index_by_title: Dict[str, List[Tuple[frozenset, dict]]] = {}
+_kofic_title_matcher = TitleMatcher()
+_category_lock = threading.Lock()
 
 def save_to_es(index: str, documents: list):
 
     es = get_es_client()
     actions = []
+    entries = []
     for doc in documents:
 
         if not doc or not isinstance(doc, dict):
@@ -25,50 +33,25 @@ def save_to_es(index: str, documents: list):
 
         is_update  = doc.pop("__update__", False)
         is_delete  = doc.pop("__delete__", False)
-        kofic_code = doc.get("KOFICCode")
-        movie_nm   = doc.get("movieNm")
-        doc_id = None
+        entries.append((doc, is_update, is_delete))
+
+    # 🧠 update / delete 대상 문서 id 를 일괄 조회 (문서별 검색 없음)
+    targets = resolve_target_hits(es, index, entries)
+
+    for (doc, is_update, is_delete), hit in zip(entries, targets):
 
         if is_delete:
-            try:
-                if kofic_code:
-                    search_result = es.search(index=index, query={"term": {"KOFICCode.keyword": kofic_code}})
-                else:
-                    search_result = es.search(index=index, query={"term": {"movieNm.keyword": movie_nm}})
-                hits = search_result["hits"]["hits"]
-                if hits:
-                    doc_id = hits[0]["_id"]
-                    actions.append({
-                        "_op_type": "delete",
-                        "_index": index,
-                        "_id": doc_id
-                    })
-            except Exception as e:
-                logger.warning(f"[ES] 문서 삭제 실패: {doc_id}, 예외: {e}")
+            if hit:
+                actions.append({
+                    "_op_type": "delete",
+                    "_index": index,
+                    "_id": hit["_id"]
+                })
             continue  # 삭제 완료 후 다음 문서 처리
 
         elif is_update :
-
-            try:
-                # 🧠 기존 문서 조회
-                search_result = es.search(index=index, query={"term": {"KOFICCode.keyword": kofic_code}})
-                hits = search_result["hits"]["hits"]
-
-                if hits:
-
-                    setting_doc(hits=hits, doc=doc, actions=actions, index=index)
-
-                else:
-                    search_result = es.search(index=index, query={"term": {"movieNm.keyword": movie_nm}})
-                    hits = search_result["hits"]["hits"]
-
-                    if hits:
-
-                        setting_doc(hits=hits, doc=doc, actions=actions, index=index)
-
-
-            except Exception as e:
-                logger.warning(f"[ES] 기존 문서 조회 실패: {doc_id}, 예외: {e}")
+            if hit:
+                setting_doc(hits=[hit], doc=doc, actions=actions, index=index)
         else:
             action = {
                 "_op_type": "index",
@@ -77,9 +60,76 @@ def save_to_es(index: str, documents: list):
             }
             actions.append(action)
 
-    success, _ = bulk(es, actions, raise_on_error=False)
-    print(f"✅ Elasticsearch 저장 완료: {success}/{len(actions)}")
-    es.indices.refresh(index=index)
+    success, failed = BulkWriter(es).write(index, actions)
+    print(f"✅ Elasticsearch 저장 완료: {success}/{len(actions)} (실패 {failed})")
+    return success, failed
+
+# save_to_es 대상 문서 일괄 조회
+# delete 는 KOFICCode 가 있으면 KOFICCode, 없으면 제목으로 / update 는 KOFICCode 우선 후 제목으로 조회
+def resolve_target_hits(es, index: str, entries: list) -> list:
+    targets = [None] * len(entries)
+    use_cache = index == "movie-index"
+
+    by_code = {}
+    for i, (doc, is_update, is_delete) in enumerate(entries):
+        kofic_code = doc.get("KOFICCode")
+        if (is_delete or is_update) and kofic_code:
+            by_code.setdefault(kofic_code, []).append(i)
+
+    found = _lookup_hits(es, index, "KOFICCode", by_code.keys(), _cached_movies_by_kofic_code if use_cache else None)
+    for code, positions in by_code.items():
+        for i in positions:
+            targets[i] = found.get(code)
+
+    by_title = {}
+    for i, (doc, is_update, is_delete) in enumerate(entries):
+        movie_nm = doc.get("movieNm")
+        if not movie_nm or targets[i]:
+            continue
+        if (is_delete and not doc.get("KOFICCode")) or is_update:
+            by_title.setdefault(movie_nm, []).append(i)
+
+    found = _lookup_hits(es, index, "movieNm", by_title.keys(), _cached_movies_by_title if use_cache else None)
+    for title, positions in by_title.items():
+        for i in positions:
+            targets[i] = found.get(title)
+
+    return targets
+
+# 캐시 우선 조회 후, 캐시에 없는 값만 terms 쿼리로 배치 조회
+def _lookup_hits(es, index: str, field: str, values, cache: Dict[str, dict] | None) -> Dict[str, dict]:
+    if not values:
+        return {}
+
+    found = {}
+    misses = []
+    for value in values:
+        cached = cache.get(value) if cache is not None else None
+        if cached and cached.get("_id"):
+            found[value] = {"_id": cached["_id"], "_source": cached}
+        else:
+            misses.append(value)
+    cache_hits = len(found)
+
+    batch_size = int(os.getenv("ES_LOOKUP_BATCH_SIZE", "500"))
+    for start in range(0, len(misses), batch_size):
+        chunk = misses[start:start + batch_size]
+        wanted = set(chunk)
+        try:
+            response = es.search(
+                index=index,
+                query={"terms": {f"{field}.keyword": chunk}},
+                size=min(len(chunk) * 2, 10000)
+            )
+            for hit in response["hits"]["hits"]:
+                value = hit["_source"].get(field)
+                if value in wanted and value not in found:
+                    found[value] = hit
+        except Exception as e:
+            logger.warning(f"[ES] 기존 문서 일괄 조회 실패 ({field}, {len(chunk)}건), 예외: {e}")
+
+    logger.info(f"[ES] {field} 기준 대상 문서 조회: 캐시 HIT {cache_hits}건 / ES 조회 {len(misses)}건")
+    return found
 
 # save_to_es doc 셋팅
 def setting_doc (hits, doc, actions, index):
@@ -174,7 +224,7 @@ def update_kofic_docs_with_category_ids():
                 })
 
         if actions:
-            bulk(es, actions)
+            BulkWriter(es, refresh_policy="none").write("movie-index", actions)
             logger.info(f"[BULK UPDATE] {len(actions)}개의 문서가 성공적으로 업데이트되었습니다.")
         else:
             logger.info("[BULK UPDATE] 업데이트할 문서가 없습니다.")
@@ -182,42 +232,121 @@ def update_kofic_docs_with_category_ids():
     except Exception as e:
         logger.error(f"[ERROR] KOFIC 문서 업데이트 실패: {e}")
 
-# category-level-two fetch/create
-def fetch_or_create_category(nm: str, parent_nm: str = "MOVIE") -> Dict[str, str]:
-
-    es = get_es_client()
-    key = (nm.strip().upper(), parent_nm.strip().upper())
-    if key in category_cache:
-        return category_cache[key]
-
-    query = {
-        "query": {
-            "bool": {
-                "must": [
-                    {"match": {"nm": nm}},
-                    {"match": {"parentNm": parent_nm}}
-                ]
+# category-level-two 일괄 조회/생성 (terms 쿼리 1회 + bulk 생성 1회)
+def resolve_categories(pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, str]]:
+    resolved = {}
+    missing: Dict[Tuple[str, str], Tuple[str, str]] = {}
+    for nm, parent_nm in pairs:
+        key = (nm.strip().upper(), parent_nm.strip().upper())
+        if key in category_cache:
+            resolved[key] = category_cache[key]
+        else:
+            missing[key] = (nm.strip(), parent_nm.strip())
+
+    if not missing:
+        return resolved
+
+    with _category_lock:
+        for key in [k for k in missing if k in category_cache]:
+            resolved[key] = category_cache[key]
+            del missing[key]
+        if not missing:
+            return resolved
+
+        es = get_es_client()
+        try:
+            # 기존과 같이 분석된 nm / parentNm 필드에 match (대소문자 무시) 후, 대문자 키가 같은 문서만 사용
+            # (keyword 필드 terms 는 원본 대소문자로만 일치하여 "Drama" 가 있어도 "DRAMA" 를 새로 생성하게 됨)
+            query = {
+                "bool": {
+                    "should": [
+                        {"bool": {"must": [
+                            {"match": {"nm": {"query": nm, "operator": "and"}}},
+                            {"match": {"parentNm": {"query": parent_nm, "operator": "and"}}}
+                        ]}}
+                        for nm, parent_nm in missing.values()
+                    ],
+                    "minimum_should_match": 1
+                }
             }
-        }
-    }
-    try:
-        response = es.search(index="category-level-two-index", body=query)
-        hits = response.get("hits", {}).get("hits", [])
-        if hits:
-            doc = hits[0]["_source"]
-            doc["id"] = hits[0]["_id"]
-            category_cache[key] = doc
-            return doc
-
-        # 없으면 새로 생성
-        doc = {"id": id, "nm": nm, "parentNm": parent_nm}
-        es.index(index="category-level-two-index", document=doc)
-        category_cache[key] = doc
-        logger.info(f"[CATEGORY] Created new category: {nm}, {parent_nm}")
-        return doc
-    except Exception as e:
-        logger.warning(f"[CATEGORY] 검색 실패 또는 생성 실패 - {nm}: {e}")
-        return {}
+            response = es.search(index="category-level-two-index", query=query, size=max(100, len(missing) * 10))
+            for hit in response.get("hits", {}).get("hits", []):
+                src = hit["_source"]
+                key = (src.get("nm", "").strip().upper(), src.get("parentNm", "").strip().upper())
+                if key in missing:
+                    src["id"] = hit["_id"]
+                    category_cache[key] = src
+                    resolved[key] = src
+                    del missing[key]
+        except Exception as e:
+            logger.warning(f"[CATEGORY] 카테고리 일괄 조회 실패 ({len(missing)}건): {e}")
+            return resolved
+
+        if not missing:
+            return resolved
+
+        # 없는 카테고리는 bulk 한 번으로 생성하고 응답의 _id 를 사용
+        try:
+            operations = []
+            for nm, parent_nm in missing.values():
+                operations.append({"index": {"_index": "category-level-two-index"}})
+                operations.append({"nm": nm, "parentNm": parent_nm})
+
+            response = es.bulk(body=operations, refresh="wait_for")
+            for (key, (nm, parent_nm)), item in zip(missing.items(), response.get("items", [])):
+                info = item.get("index", {})
+                if info.get("_id") and info.get("status", 500) < 300:
+                    doc = {"id": info["_id"], "nm": nm, "parentNm": parent_nm}
+                    category_cache[key] = doc
+                    resolved[key] = doc
+                    logger.info(f"[CATEGORY] Created new category: {nm}, {parent_nm}")
+                else:
+                    logger.warning(f"[CATEGORY] 카테고리 생성 실패 - {nm}: {info.get('error')}")
+        except Exception as e:
+            logger.warning(f"[CATEGORY] 카테고리 일괄 생성 실패 ({len(missing)}건): {e}")
+
+    return resolved
+
+## 크롤링 배치 동안 카테고리 참조를 모아두었다가 한 번에 해석
+class CategoryResolver:
+
+    def __init__(self):
+        self._pending: Dict[Tuple[str, str], Dict[str, str]] = {}
+
+    ## 캐시에 있으면 캐시 문서, 없으면 resolve() 시 채워질 placeholder 반환
+    def ref(self, nm: str, parent_nm: str = "MOVIE") -> Dict[str, str]:
+        key = (nm.strip().upper(), parent_nm.strip().upper())
+        if key in category_cache:
+            return category_cache[key]
+        return self._pending.setdefault(key, {"nm": nm.strip(), "parentNm": parent_nm.strip()})
+
+    ## 모아둔 참조를 일괄 해석하고, documents 가 주어지면 해석되지 않은(id 없는) 카테고리를 문서에서 제거
+    def resolve(self, documents: Iterable[dict] = ()):
+        if self._pending:
+            pending, self._pending = self._pending, {}
+            resolved = resolve_categories(
+                (placeholder["nm"], placeholder["parentNm"]) for placeholder in pending.values()
+            )
+            for key, placeholder in pending.items():
+                if key in resolved:
+                    placeholder.update(resolved[key])
+            logger.info(f"[CATEGORY] 카테고리 {len(pending)}건 일괄 해석 (성공 {len(resolved)}건)")
+
+        dropped = set()
+        for doc in documents:
+            if not doc or "categoryLevelTwo" not in doc:
+                continue
+            categories = doc["categoryLevelTwo"]
+            if isinstance(categories, list):
+                kept = [c for c in categories if c and c.get("id")]
+                dropped.update(c.get("nm") for c in categories if c and not c.get("id"))
+                doc["categoryLevelTwo"] = kept
+            elif categories and not categories.get("id"):
+                # 단일 카테고리 (KOPIS) 는 기존과 같이 빈 dict
+                dropped.add(categories.get("nm"))
+                doc["categoryLevelTwo"] = {}
+        if dropped:
+            logger.warning(f"[CATEGORY] 해석되지 않은 카테고리 제외: {sorted(nm for nm in dropped if nm)}")
 
 # kofic-index 캐싱
 def load_all_kofic_into_cache(index_name="kofic-index"):
@@ -235,6 +364,7 @@ def load_all_kofic_into_cache(index_name="kofic-index"):
                     "_id": hit["_id"]
                 }
         logger.info(f"[CACHE] kofic 캐시 적재 완료: {len(_cached_kofic_by_kofic_code)}편")
+        build_kofic_title_index()
     except Exception as e:
         logger.warning(f"[CACHE] kofic-index 캐싱 실패: {e}")
 
@@ -245,34 +375,44 @@ def exists_kofic_by_kofic_code(kofic_code: str) -> bool:
         return False
     return kofic_code in _cached_kofic_by_kofic_code
 
+# kofic-index 제목 보조 인덱스 생성 (정규화 제목 -> [(감독 frozenset, 문서)]) + 유사 제목 매처
+def build_kofic_title_index():
+    global _kofic_index_by_title, _kofic_title_matcher
+
+    index: Dict[str, List[Tuple[frozenset, dict]]] = {}
+    records = []
+    for data in _cached_kofic_by_kofic_code.values():
+        title = normalize_title(data.get("movieNm"))
+        directors = frozenset(d for d in data.get("directors", []) if d)
+        if title and directors:
+            index.setdefault(title, []).append((directors, data))
+            records.append({"movieNm": data.get("movieNm"), "directors": directors, "data": data})
+
+    _kofic_index_by_title = index
+    _kofic_title_matcher = TitleMatcher().build(records)
+    logger.info(f"[CACHE] kofic 제목 인덱스 생성 완료: {len(index)}개 제목")
+
 # kofic-index 캐시 기반 title/director 로 검색
 def search_kofic_index_by_title_and_director(title: str, director_list: list) -> dict:
 
-    logger.info(f"[CACHE] Title {title} & Director: {director_list}")
-
     if not title or not director_list:
         return {}
 
-    best_match = None
-    for kofic_code, data in _cached_kofic_by_kofic_code.items():
-        # 제목 완전 일치
-        if data.get("movieNm") != title:
-            continue
+    directors = set(director_list)
 
-        logger.info(f"[CACHE] Title Correct: {director_list}")
-        logger.info(f"[CACHE] Title {data.get("movieNm", [])} & Director IN KOFIC: {data.get("directors", [])}")
-        # 감독 일치율 계산
-        cached_directors = data.get("directors", [])
-        if not cached_directors:
-            continue
+    # 1. 정규화 제목 완전 일치 + 감독이 한 명이라도 일치하면 첫 매칭 결과 반환
+    for cached_directors, data in _kofic_index_by_title.get(normalize_title(title), ()):
+        if not cached_directors.isdisjoint(directors):
+            logger.debug(f"[CACHE] KOFIC 매칭: {title} -> {data.get('KOFICCode')}")
+            return data
 
-        logger.info(f"[CACHE] Director Correct: {director_list}")
-        matched = any(d in cached_directors for d in director_list)
-        if matched:
-            best_match = data
-            break  # 첫 매칭 결과 반환 (또는 일치율 높은 결과를 탐색할 수도 있음)
+    # 2. 유사 제목 후보 중 감독이 일치하는 가장 높은 점수의 결과
+    for score, record in _kofic_title_matcher.search(title):
+        if not record["directors"].isdisjoint(directors):
+            logger.info(f"[CACHE] KOFIC 유사 제목 매칭: {title} -> {record['movieNm']} ({score:.2f})")
+            return record["data"]
 
-    return best_match if best_match else {}
+    return {}
 
 # kopis-index 캐싱
 def load_all_kopis_into_cache(index_name="kopis-index"):
@@ -314,11 +454,12 @@ def exists_kopis_by_kopis_code(kopis_code: str) -> bool:
 
 # movie-index 캐싱
 def load_all_movies_into_cache(index_name="movie-index"):
-    global _cached_movies_by_kofic_code, _cached_movies_by_title
+    global _cached_movies_by_kofic_code, _cached_movies_by_title, _cached_movies_by_reservation_link
 
     es = get_es_client()
-    _cached_movies_by_kofic_code.clear()
-    _cached_movies_by_title.clear()
+    movies_by_kofic_code: Dict[str, dict] = {}
+    movies_by_title: Dict[str, dict] = {}
+    movies_by_reservation_link: Dict[str, dict] = {}
 
     try:
         response = es.search(index=index_name, body={"query": {"match_all": {}}}, size=10000)
@@ -330,11 +471,21 @@ def load_all_movies_into_cache(index_name="movie-index"):
             title = src.get("movieNm", "").strip()
 
             if kofic_code:
-                _cached_movies_by_kofic_code[kofic_code] = {**src, "_id": doc_id}
-                print(_cached_movies_by_kofic_code[kofic_code])
+                movies_by_kofic_code[kofic_code] = {**src, "_id": doc_id}
+                print(movies_by_kofic_code[kofic_code])
             elif title:
-                _cached_movies_by_title[title] = {**src, "_id": doc_id}
-                print(_cached_movies_by_title[title])
+                movies_by_title[title] = {**src, "_id": doc_id}
+                print(movies_by_title[title])
+
+            # 극장 상세 페이지 주소(예매 링크) -> 문서 (KOFIC 매칭으로 제목이 바뀐 문서도 찾을 수 있도록)
+            for link in src.get("reservationLink") or []:
+                if link:
+                    movies_by_reservation_link[link] = {**src, "_id": doc_id}
+
+        # 병렬로 조회 중인 크롤러가 빈 캐시를 보지 않도록 완성된 dict 로 교체
+        _cached_movies_by_kofic_code = movies_by_kofic_code
+        _cached_movies_by_title = movies_by_title
+        _cached_movies_by_reservation_link = movies_by_reservation_link
 
         logger.info(f"[CACHE] 영화 캐시 적재 완료: {len(_cached_movies_by_kofic_code)}편")
         logger.info(f"[CACHE] 영화 캐시 적재 완료: {len(_cached_movies_by_title)}편")
@@ -364,6 +515,10 @@ def exists_movie_by_nm(nm: str):
 
     return nm in _cached_movies_by_title if nm else False
 
+# movie-index 예매 링크 기반 검색 (KOFICCode 유무와 관계없이)
+def get_cached_movie_by_reservation_link(link: str) -> dict | None:
+    return _cached_movies_by_reservation_link.get(link) if link else None
+
 # movie-index kofic 기반 검색
 def get_movie_document_id_by_kofic_code(kofic_code: str) -> str | None:
     doc = _cached_movies_by_kofic_code.get(kofic_code)
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Mapping
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+# 소스별 기본 TTL (초), HTTP_CACHE_TTL_<SOURCE> 로 덮어쓰기 가능
+DEFAULT_TTLS = {
+    "CGV": 24 * 3600,
+    "KOFIC": 7 * 24 * 3600,
+    "KOPIS": 3 * 24 * 3600,
+    "DEFAULT": 24 * 3600
+}
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def _ignored_params() -> set:
+    # API 키가 바뀌어도 같은 응답으로 취급
+    return {v.strip() for v in os.getenv("HTTP_CACHE_IGNORE_PARAMS", "key,service").split(",") if v.strip()}
+
+## URL + 정렬된 params 기반 캐시 키
+def cache_key(url: str, params: dict | None = None) -> str:
+    ignored = _ignored_params()
+    items = sorted((k, str(v)) for k, v in (params or {}).items() if k not in ignored and v is not None)
+    raw = f"{url}?{urlencode(items)}" if items else url
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def source_ttl(source: str) -> float:
+    source = (source or "DEFAULT").upper()
+    default = DEFAULT_TTLS.get(source, DEFAULT_TTLS["DEFAULT"])
+    return float(os.getenv(f"HTTP_CACHE_TTL_{source}", str(default)))
+
+## 캐시된 응답 한 건
+class CachedResponse:
+
+    def __init__(self, url: str, status: int, headers: dict, body: bytes, etag: str | None,
+                 last_modified: str | None, expires_at: float):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.expires_at > time.time()
+
+    @property
+    def can_revalidate(self) -> bool:
+        return bool(self.etag or self.last_modified)
+
+## 디스크(SQLite) 기반 HTTP 응답 캐시 (TTL + ETag/Last-Modified 재검증 + 용량 제한 LRU)
+class HttpCache:
+
+    def __init__(self, path: str | None = None, max_bytes: int | None = None):
+        self.path = path or os.getenv("HTTP_CACHE_PATH", ".cache/http_cache.sqlite3")
+        self.max_bytes = max_bytes or int(os.getenv("HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS response (
+                cache_key     TEXT PRIMARY KEY,
+                source        TEXT NOT NULL,
+                url           TEXT NOT NULL,
+                status        INTEGER NOT NULL,
+                headers       TEXT NOT NULL,
+                body          BLOB NOT NULL,
+                etag          TEXT,
+                last_modified TEXT,
+                expires_at    REAL NOT NULL,
+                accessed_at   REAL NOT NULL,
+                size          INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_response_accessed ON response (accessed_at)")
+        self._conn.commit()
+        # 전체 크기 누적값 (put / 삭제 때 갱신, 매 저장마다 전체 합계를 계산하지 않도록)
+        self._total = self._size_sum()
+
+    def _size_sum(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM response").fetchone()[0]
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, status, headers, body, etag, last_modified, expires_at FROM response WHERE cache_key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE response SET accessed_at = ? WHERE cache_key = ?", (time.time(), key))
+            self._conn.commit()
+
+        url, status, headers, body, etag, last_modified, expires_at = row
+        return CachedResponse(url, status, json.loads(headers), body, etag, last_modified, expires_at)
+
+    ## headers 는 원본 응답 헤더 그대로 (서버마다 대소문자가 다르므로 ETag / Last-Modified 는 대소문자 무시하고 조회)
+    def put(self, key: str, source: str, url: str, status: int, headers: Mapping[str, str], body: bytes, ttl: float):
+        lowered = {name.lower(): value for name, value in headers.items()}
+        now = time.time()
+        with self._lock:
+            replaced = self._conn.execute("SELECT size FROM response WHERE cache_key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO response "
+                "(cache_key, source, url, status, headers, body, etag, last_modified, expires_at, accessed_at, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, source, url, status, json.dumps(dict(headers), ensure_ascii=False), body,
+                 lowered.get("etag"), lowered.get("last-modified"), now + ttl, now, len(body))
+            )
+            self._conn.commit()
+            self._total += len(body) - (replaced[0] if replaced else 0)
+        self._evict()
+
+    ## 304 응답: 본문은 그대로 두고 만료 시각만 연장
+    def touch(self, key: str, ttl: float):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE response SET expires_at = ?, accessed_at = ? WHERE cache_key = ?", (now + ttl, now, key)
+            )
+            self._conn.commit()
+
+    ## 전체 크기가 상한을 넘으면 가장 오래 조회되지 않은 항목부터 삭제
+    def _evict(self, batch: int = 100):
+        with self._lock:
+            if self._total <= self.max_bytes:
+                return
+
+            # 다른 프로세스가 같은 DB 에 쓴 경우를 위해 삭제 전에만 실제 합계로 다시 맞춤
+            self._total = self._size_sum()
+            removed = 0
+            while self._total > self.max_bytes:
+                rows = self._conn.execute(
+                    "SELECT cache_key, size FROM response ORDER BY accessed_at ASC LIMIT ?", (batch,)
+                ).fetchall()
+                if not rows:
+                    break
+                for key, size in rows:
+                    if self._total <= self.max_bytes:
+                        break
+                    self._conn.execute("DELETE FROM response WHERE cache_key = ?", (key,))
+                    self._total -= size
+                    removed += 1
+            self._conn.commit()
+        if removed:
+            logger.info(f"[HTTP_CACHE] 용량 초과로 {removed}건 삭제")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def is_enabled() -> bool:
+    return os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+
+## 프로세스 전체에서 공유하는 응답 캐시
+def get_http_cache() -> HttpCache:
+    global _cache
+
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = HttpCache()
+    return _cache
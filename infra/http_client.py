@@ -0,0 +1,211 @@
+import logging
+import os
+import socket
+import ssl
+import threading
+import time
+from typing import Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import HTTPConnectionPool, HTTPSConnectionPool, PoolManager
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+
+from infra import http_cache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+}
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+_dns_cache: dict[tuple, tuple[float, list[str]]] = {}
+_dns_lock = threading.Lock()
+
+def _dns_ttl() -> float:
+    return float(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+
+## TTL 기반 DNS 캐시 (공용 세션의 연결에만 적용, 연결이 재수립될 때마다 조회하지 않도록)
+def _resolve_cached(host: str, port: int) -> list[str]:
+    key = (host, port)
+    now = time.monotonic()
+
+    with _dns_lock:
+        cached = _dns_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+
+    addresses = []
+    for _, _, _, _, sockaddr in socket.getaddrinfo(host, port, socket.AF_UNSPEC, socket.SOCK_STREAM):
+        if sockaddr[0] not in addresses:
+            addresses.append(sockaddr[0])
+    with _dns_lock:
+        _dns_cache[key] = (now + _dns_ttl(), addresses)
+    return addresses
+
+def _forget_cached(host: str, port: int):
+    with _dns_lock:
+        _dns_cache.pop((host, port), None)
+
+## 캐시된 주소로 접속 (Host 헤더 / SNI / 인증서 검증은 원래 호스트 이름 사용)
+class _CachedDnsConnectionMixin:
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = _resolve_cached(host, self.port)
+        except OSError as e:
+            raise NewConnectionError(self, f"Failed to resolve {host}: {e}")
+
+        last_error = None
+        try:
+            for address in addresses:
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError) as e:
+                    last_error = e
+        finally:
+            self._dns_host = host
+
+        # 캐시된 주소가 모두 실패하면 다음 연결에서 다시 조회
+        _forget_cached(host, self.port)
+        raise last_error or NewConnectionError(self, f"No address for {host}")
+
+class _CachedDnsHTTPConnection(_CachedDnsConnectionMixin, HTTPConnection):
+    pass
+
+class _CachedDnsHTTPSConnection(_CachedDnsConnectionMixin, HTTPSConnection):
+    pass
+
+class _CachedDnsHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CachedDnsHTTPConnection
+
+class _CachedDnsHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CachedDnsHTTPSConnection
+
+def _use_dns_cache(poolmanager: PoolManager):
+    if _dns_ttl() > 0:
+        poolmanager.pool_classes_by_scheme = {
+            "http": _CachedDnsHTTPConnectionPool,
+            "https": _CachedDnsHTTPSConnectionPool
+        }
+
+## 공용 세션 기본 어댑터: 커넥션 풀 + keep-alive + DNS 캐시 (socket 모듈 전역은 건드리지 않음)
+class CachedDnsAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        _use_dns_cache(self.poolmanager)
+
+## 호스트 단위로 SECLEVEL=1 TLS 컨텍스트를 적용하는 어댑터
+class SSLAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        ctx = ssl.create_default_context()
+        ctx.set_ciphers("DEFAULT@SECLEVEL=1")  # 핵심
+        self.poolmanager = PoolManager(*args, ssl_context=ctx, **kwargs)
+        _use_dns_cache(self.poolmanager)
+
+def _env_list(name: str, default: str) -> list[str]:
+    return [v.strip() for v in os.getenv(name, default).split(",") if v.strip()]
+
+def _default_timeout() -> tuple[float, float]:
+    return (
+        float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+        float(os.getenv("HTTP_READ_TIMEOUT", "30"))
+    )
+
+def _create_session() -> requests.Session:
+    pool_connections = int(os.getenv("HTTP_POOL_CONNECTIONS", "16"))
+    pool_maxsize = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+
+    # 기본 어댑터: 호스트별 커넥션 풀 + keep-alive + DNS 캐시
+    default_adapter = CachedDnsAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount("http://", default_adapter)
+    session.mount("https://", default_adapter)
+
+    # 구형 TLS 설정이 필요한 호스트에만 SSLAdapter 적용
+    for host in _env_list("HTTP_LEGACY_TLS_HOSTS", "www.cgv.co.kr,m.cgv.co.kr,cgv.co.kr"):
+        session.mount(f"https://{host}/", SSLAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize))
+
+    logger.info(f"[HTTP] 공용 세션 생성 (pool={pool_connections}x{pool_maxsize})")
+    return session
+
+## 프로세스 전체에서 공유하는 HTTP 세션
+def get_session() -> requests.Session:
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+    return _session
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    kwargs.setdefault("timeout", _default_timeout())
+    return get_session().request(method, url, **kwargs)
+
+def get(url: str, params: dict | None = None, **kwargs) -> requests.Response:
+    return request("GET", url, params=params, **kwargs)
+
+def post(url: str, data=None, json=None, **kwargs) -> requests.Response:
+    return request("POST", url, data=data, json=json, **kwargs)
+
+class NetworkNotAllowed(Exception):
+    pass
+
+# 캐시 항목을 requests.Response 로 복원
+def _to_response(entry) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry.status
+    response.url = entry.url
+    response.headers.update(entry.headers)
+    response._content = entry.body
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+## 디스크 캐시를 거치는 GET (TTL 내 응답은 네트워크 없이 반환, 만료 시 ETag/Last-Modified 재검증)
+## allow_network 가 False 를 반환하면 (ex. API 요청 한도) 만료된 캐시라도 반환하고, 없으면 NetworkNotAllowed
+def cached_get(url: str, params: dict | None = None, source: str = "DEFAULT", ttl: float | None = None,
+               allow_network: Callable[[], bool] | None = None, **kwargs) -> requests.Response:
+    if not http_cache.is_enabled():
+        if allow_network is not None and not allow_network():
+            raise NetworkNotAllowed(url)
+        return get(url, params=params, **kwargs)
+
+    cache = http_cache.get_http_cache()
+    key = http_cache.cache_key(url, params)
+    ttl = http_cache.source_ttl(source) if ttl is None else ttl
+    entry = cache.get(key)
+
+    if entry is not None and entry.is_fresh:
+        return _to_response(entry)
+
+    if allow_network is not None and not allow_network():
+        if entry is not None:
+            logger.info(f"[HTTP_CACHE] 네트워크 요청 불가, 만료된 캐시 사용: {url}")
+            return _to_response(entry)
+        raise NetworkNotAllowed(url)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    response = get(url, params=params, headers=headers, **kwargs)
+
+    if response.status_code == 304 and entry is not None:
+        cache.touch(key, ttl)
+        return _to_response(entry)
+
+    if response.status_code == 200 and ttl > 0:
+        cache.put(key, source.upper(), response.url, response.status_code, response.headers, response.content, ttl)
+    return response
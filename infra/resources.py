@@ -0,0 +1,54 @@
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Set
+
+from infra.es_utils import load_all_categories_into_cache, load_all_kofic_into_cache, load_all_kopis_into_cache, \
+    load_all_movies_into_cache
+
+logger = logging.getLogger(__name__)
+
+## 크롤러가 사용하는 캐시 자원을 import 시점이 아닌 실행 시점에 적재하기 위한 registry
+_loaders: Dict[str, Callable[[], None]] = {}
+_loaded: Set[str] = set()
+_lock = threading.Lock()
+
+def register_resource(name: str, loader: Callable[[], None]):
+    _loaders[name] = loader
+
+def _load(name: str):
+    if name not in _loaders:
+        raise KeyError(f"❌ [RESOURCE] 등록되지 않은 자원: {name}")
+
+    started = time.perf_counter()
+    _loaders[name]()
+    with _lock:
+        _loaded.add(name)
+    logger.info(f"[RESOURCE] {name} 적재 완료 ({time.perf_counter() - started:.2f}s)")
+
+## 지정한 자원들을 병렬로 적재 (force=True 면 이미 적재된 자원도 새로 적재)
+def warm_up(names: Iterable[str], force: bool = True, max_workers: int | None = None):
+    names = list(dict.fromkeys(names))
+    with _lock:
+        targets = [name for name in names if force or name not in _loaded]
+    if not targets:
+        return
+
+    max_workers = max_workers or int(os.getenv("RESOURCE_WARM_UP_WORKERS", "4"))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="warm-up") as executor:
+        list(executor.map(_load, targets))
+
+## 아직 적재되지 않은 자원만 적재
+def ensure_resources(names: Iterable[str]):
+    warm_up(names, force=False)
+
+def is_loaded(name: str) -> bool:
+    return name in _loaded
+
+register_resource("categories:MOVIE", lambda: load_all_categories_into_cache("MOVIE"))
+register_resource("categories:PERFORMING_ARTS", lambda: load_all_categories_into_cache("PERFORMING_ARTS"))
+register_resource("kofic", load_all_kofic_into_cache)
+register_resource("kopis", load_all_kopis_into_cache)
+register_resource("movies", load_all_movies_into_cache)
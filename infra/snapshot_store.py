@@ -0,0 +1,200 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 해시 계산에서 제외할 키 (__update__ / __delete__ 는 내용이 아닌 ES 캐시 상태 / 실행 시각에 따른 처리 방식)
+_VOLATILE_KEYS = {"__update__", "__delete__"}
+
+_store = None
+_store_lock = threading.Lock()
+
+## 정렬된 JSON 직렬화 기반의 안정적인 내용 해시
+def content_hash(doc: dict) -> str:
+    payload = {k: v for k, v in doc.items() if k not in _VOLATILE_KEYS}
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def _key_hash(key: str) -> str:
+    return hashlib.sha1((key or "").encode("utf-8")).hexdigest()
+
+## movie-index 문서 식별자 (KOFICCode 우선, 없으면 제목)
+def movie_identity(doc: dict) -> str:
+    kofic_code = doc.get("KOFICCode")
+    return f"kofic:{kofic_code}" if kofic_code else f"title:{(doc.get('movieNm') or '').strip()}"
+
+## 스냅샷 비교 결과
+class SnapshotDiff:
+
+    def __init__(self, source: str):
+        self.source = source
+        self.new: List[dict] = []
+        self.changed: List[dict] = []
+        self.unchanged: List[dict] = []
+        # 이번 결과에 없는 직전 문서 (스냅샷에서만 제거, 아래 diff 참고)
+        self.vanished: List[str] = []
+        self.hashes: Dict[str, str] = {}
+
+    # ES 에 실제로 써야 하는 문서
+    @property
+    def changed_docs(self) -> List[dict]:
+        return self.new + self.changed
+
+    def summary(self) -> str:
+        return (f"new={len(self.new)}, changed={len(self.changed)}, "
+                f"unchanged={len(self.unchanged)}, vanished={len(self.vanished)}")
+
+## 크롤링 결과의 직전 상태를 보관하는 로컬 SQLite 스냅샷 저장소
+class SnapshotStore:
+
+    def __init__(self, path: str | None = None):
+        self.path = path or os.getenv("SNAPSHOT_DB_PATH", ".cache/snapshot.sqlite3")
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshot (
+                source       TEXT NOT NULL,
+                identity     TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                updated_at   INTEGER NOT NULL,
+                PRIMARY KEY (source, identity)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS listing_fingerprint (
+                source      TEXT NOT NULL,
+                listing_key TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                fetched_at  INTEGER NOT NULL,
+                PRIMARY KEY (source, listing_key)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS request_usage (
+                api      TEXT NOT NULL,
+                key_hash TEXT NOT NULL,
+                day      TEXT NOT NULL,
+                used     INTEGER NOT NULL,
+                PRIMARY KEY (api, key_hash, day)
+            )
+        """)
+        self._conn.commit()
+
+    ## API 키별 하루 호출 수 (지난 날짜 기록은 함께 정리), 키는 해시로만 저장
+    def get_usage(self, api: str, key: str, day: str) -> int:
+        with self._lock:
+            self._conn.execute("DELETE FROM request_usage WHERE api = ? AND day < ?", (api, day))
+            self._conn.commit()
+            row = self._conn.execute(
+                "SELECT used FROM request_usage WHERE api = ? AND key_hash = ? AND day = ?",
+                (api, _key_hash(key), day)
+            ).fetchone()
+        return row[0] if row else 0
+
+    ## 한도 안에서 호출 수 1 증가 (여러 프로세스가 같은 DB 를 써도 한도를 넘지 않도록 조건부 UPDATE), 한도에 도달했으면 False
+    def try_use(self, api: str, key: str, day: str, limit: int) -> bool:
+        key_hash = _key_hash(key)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO request_usage (api, key_hash, day, used) VALUES (?, ?, ?, 0)",
+                (api, key_hash, day)
+            )
+            cursor = self._conn.execute(
+                "UPDATE request_usage SET used = used + 1 WHERE api = ? AND key_hash = ? AND day = ? AND used < ?",
+                (api, key_hash, day, limit)
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    ## 목록 항목의 마지막 상세 조회 시점의 fingerprint, (fingerprint, fetched_at) 반환
+    def get_listing(self, source: str, listing_key: str) -> Tuple[str, int] | None:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT fingerprint, fetched_at FROM listing_fingerprint WHERE source = ? AND listing_key = ?",
+                (source, listing_key)
+            ).fetchone()
+
+    def _load(self, source: str) -> Dict[str, str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT identity, content_hash FROM snapshot WHERE source = ?", (source,)
+            ).fetchall()
+        return dict(rows)
+
+    ## 새 / 변경 / 동일 / 사라짐 분류 (ES I/O 전에 호출)
+    def diff(self, source: str, documents: list, identity: Callable[[dict], str] = movie_identity) -> SnapshotDiff:
+        previous = self._load(source)
+        result = SnapshotDiff(source)
+        seen = set()
+
+        for doc in documents:
+            if not doc or not isinstance(doc, dict):
+                continue
+
+            key = identity(doc)
+            digest = content_hash(doc)
+            seen.add(key)
+            result.hashes[key] = digest
+
+            if key not in previous:
+                result.new.append(doc)
+            elif previous[key] != digest:
+                result.changed.append(doc)
+            elif doc.get("__delete__"):
+                # 삭제 대상이 ES 에 (다시) 있으면 삭제를 다시 보내고, 이미 없으면 할 일 없음
+                (result.changed if doc.get("__update__") else result.unchanged).append(doc)
+            elif doc.get("__update__"):
+                result.unchanged.append(doc)
+            else:
+                # 내용은 같지만 ES 에 문서가 없으므로 다시 기록
+                result.changed.append(doc)
+
+        # 목록에서 사라진 문서는 ES 에서 삭제하지 않고 스냅샷에서만 제거
+        # movie-index 문서는 여러 극장이 reservationLink 를 병합해 공유하므로 한 사이트 목록에서 빠졌다고 지울 수 없고,
+        # 삭제는 크롤러가 정한 __delete__ (개봉일 기준) 로만 처리. 다시 나타나면 새 문서로 비교하여 저장
+        result.vanished = [key for key in previous if key not in seen]
+        logger.info(f"[SNAPSHOT] {source} 비교 결과: {result.summary()}")
+        return result
+
+    ## ES 저장이 끝난 뒤 현재 상태를 스냅샷으로 확정
+    ## listings: 이번 실행에서 상세 페이지를 조회한 (목록 키, fingerprint), 저장이 성공한 경우에만 함께 기록
+    def commit(self, diff: SnapshotDiff, listings: Iterable[Tuple[str, str]] = ()):
+        now = int(time.time())
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO listing_fingerprint (source, listing_key, fingerprint, fetched_at) VALUES (?, ?, ?, ?)",
+                [(diff.source, listing_key, fingerprint, now) for listing_key, fingerprint in listings]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO snapshot (source, identity, content_hash, updated_at) VALUES (?, ?, ?, ?)",
+                [(diff.source, key, digest, now) for key, digest in diff.hashes.items()]
+            )
+            self._conn.executemany(
+                "DELETE FROM snapshot WHERE source = ? AND identity = ?",
+                [(diff.source, key) for key in diff.vanished]
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+## 프로세스 전체에서 공유하는 스냅샷 저장소
+def get_snapshot_store() -> SnapshotStore:
+    global _store
+
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SnapshotStore()
+    return _store
@@ -0,0 +1,150 @@
+import os
+import random
+import re
+import time
+import unicodedata
+from typing import Dict, Iterable, List, Set, Tuple
+
+# 상영 포맷 / 자막 여부 등 제목 뒤에 붙는 부가 정보
+_BRACKETS = re.compile(r"[\(\[\{<【][^\)\]\}>】]*[\)\]\}>】]")
+_FORMAT_SUFFIX = re.compile(
+    r"(imax|4dx|screenx|superplex|dolby|atmos|mx4d|2d|3d|4k|"
+    r"자막|더빙|리마스터링|리마스터|감독판|확장판|무삭제판|재개봉)$"
+)
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]")
+_SEQUEL_NUMBER = re.compile(r"(\d+)$")
+
+## 한글 제목 정규화 (NFKC 조합, 괄호/포맷 접미사 제거, 공백·기호 제거)
+def normalize_title(title: str | None) -> str:
+    if not title:
+        return ""
+
+    text = unicodedata.normalize("NFKC", title).lower()
+    text = _BRACKETS.sub(" ", text)
+    text = _NON_WORD.sub("", text)
+
+    # 접미사가 여러 개 붙은 경우 (ex. "IMAX 자막") 반복 제거
+    while True:
+        stripped = _FORMAT_SUFFIX.sub("", text)
+        if stripped == text or not stripped:
+            break
+        text = stripped
+    return text
+
+# 속편 번호 (ex. "범죄도시4" -> "4")
+def _sequel_number(text: str) -> str:
+    match = _SEQUEL_NUMBER.search(text)
+    return match.group(1) if match else ""
+
+def _ngrams(text: str, n: int) -> Set[str]:
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+## 문자 n-gram 역색인 기반 제목 유사도 매칭
+class TitleMatcher:
+
+    def __init__(self, threshold: float | None = None, n: int = 2):
+        self.threshold = threshold if threshold is not None else float(os.getenv("TITLE_MATCH_THRESHOLD", "0.8"))
+        self.n = n
+        self._records: List[dict] = []
+        self._grams: List[Set[str]] = []
+        self._sequels: List[str] = []
+        self._by_title: Dict[str, List[int]] = {}
+        self._postings: Dict[str, List[int]] = {}
+
+    def build(self, records: Iterable[dict], title_key: str = "movieNm") -> "TitleMatcher":
+        for record in records:
+            title = normalize_title(record.get(title_key))
+            if not title:
+                continue
+
+            pos = len(self._records)
+            grams = _ngrams(title, self.n)
+            self._records.append(record)
+            self._grams.append(grams)
+            self._sequels.append(_sequel_number(title))
+            self._by_title.setdefault(title, []).append(pos)
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(pos)
+        return self
+
+    def __len__(self):
+        return len(self._records)
+
+    ## 정규화된 제목이 완전히 같은 레코드
+    def exact(self, title: str) -> List[dict]:
+        return [self._records[pos] for pos in self._by_title.get(normalize_title(title), ())]
+
+    ## 임계값 이상인 후보를 (점수, 레코드) 로 점수 내림차순 반환 (Dice 계수)
+    def search(self, title: str, limit: int = 5) -> List[Tuple[float, dict]]:
+        normalized = normalize_title(title)
+        grams = _ngrams(normalized, self.n)
+        if not grams:
+            return []
+        sequel = _sequel_number(normalized)
+
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for pos in self._postings.get(gram, ()):
+                shared[pos] = shared.get(pos, 0) + 1
+
+        # 공유 n-gram 수로 가능한 최대 점수가 임계값 미만인 후보는 계산 생략
+        min_shared = self.threshold * len(grams) / 2
+        scored = []
+        for pos, count in shared.items():
+            if count < min_shared or self._sequels[pos] != sequel:
+                continue
+            score = 2 * count / (len(grams) + len(self._grams[pos]))
+            if score >= self.threshold:
+                scored.append((score, pos))
+
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        return [(score, self._records[pos]) for score, pos in scored[:limit]]
+
+# 정규화 / 매칭 정확도 확인용 케이스 (theatre 제목, KOFIC 제목, 매칭 기대 여부)
+ACCURACY_CASES = [
+    ("미션 임파서블: 파이널 레코닝", "미션임파서블 파이널레코닝", True),
+    ("미션 임파서블: 파이널 레코닝(IMAX)", "미션 임파서블: 파이널 레코닝", True),
+    ("F1 더 무비 (자막)", "F1 더 무비", True),
+    ("드래곤 길들이기 [더빙]", "드래곤 길들이기", True),
+    ("쥬라기 월드: 새로운 시작", "쥬라기 월드 새로운 시작", True),
+    ("기생충 흑백판", "기생충", False),
+    ("범죄도시4", "범죄도시3", False),
+    ("인사이드 아웃 2", "인사이드 아웃", False),
+]
+
+## 정확도 케이스 / 대량 조회 속도 확인
+## 사용법: python -m infra.title_matcher [카탈로그 크기]
+def _benchmark(catalog_size: int = 20000, queries: int = 5000):
+    hits = 0
+    for theatre_title, kofic_title, expected in ACCURACY_CASES:
+        matcher = TitleMatcher().build([{"movieNm": kofic_title}])
+        matched = bool(matcher.exact(theatre_title) or matcher.search(theatre_title))
+        hits += matched == expected
+        print(f"{'OK ' if matched == expected else 'NG '} {theatre_title} <-> {kofic_title} (기대 {expected}, 결과 {matched})")
+    print(f"정확도: {hits}/{len(ACCURACY_CASES)}")
+
+    rng = random.Random(42)
+    syllables = [chr(code) for code in range(0xAC00, 0xAC00 + 400)]
+    catalog = [{"movieNm": "".join(rng.choices(syllables, k=rng.randint(3, 12)))} for _ in range(catalog_size)]
+
+    started = time.perf_counter()
+    matcher = TitleMatcher().build(catalog)
+    build_time = time.perf_counter() - started
+
+    # 절반은 정규화 후 완전 일치, 절반은 마지막 글자를 바꾼 유사 제목
+    targets = []
+    for i in range(queries):
+        title = rng.choice(catalog)["movieNm"]
+        targets.append(title + " (자막)" if i % 2 else title[:-1] + rng.choice(syllables))
+    started = time.perf_counter()
+    for target in targets:
+        matcher.exact(target) or matcher.search(target)
+    per_query = (time.perf_counter() - started) / queries
+
+    print(f"카탈로그 {catalog_size}건 색인 {build_time * 1000:.1f}ms / 조회 평균 {per_query * 1_000_000:.1f}µs")
+
+if __name__ == "__main__":
+    import sys
+    _benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,115 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+## DAG 노드 실행 결과
+class NodeResult:
+    def __init__(self, name: str):
+        self.name = name
+        self.status = "PENDING"  # PENDING / SUCCESS / FAILED / SKIPPED
+        self.result: Any = None
+        self.error: Exception | None = None
+        self.started_at = 0.0
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        return f"NodeResult({self.name}, {self.status}, {self.elapsed:.2f}s)"
+
+## 의존 관계를 가진 작업들을 병렬로 실행하는 간단한 DAG 실행기
+class DagExecutor:
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max(1, max_workers)
+        self._nodes: Dict[str, Callable[[], Any]] = {}
+        self._deps: Dict[str, List[str]] = {}
+        self._after: Dict[str, List[str]] = {}
+
+    ## deps: 성공해야 실행되는 의존 노드 (실패하면 건너뜀) / after: 실행 순서만 맞추는 노드 (실패해도 실행)
+    def add(self, name: str, func: Callable[[], Any], deps: Iterable[str] = (), after: Iterable[str] = ()):
+        if name in self._nodes:
+            raise ValueError(f"❌ [DAG] 중복된 노드 이름: {name}")
+        self._nodes[name] = func
+        self._deps[name] = list(deps)
+        self._after[name] = list(after)
+        return self
+
+    def _validate(self):
+        for name in self._nodes:
+            for dep in self._deps[name] + self._after[name]:
+                if dep not in self._nodes:
+                    raise ValueError(f"❌ [DAG] {name} 의 의존 노드 {dep} 가 존재하지 않습니다.")
+
+        # 순환 의존 검사
+        visited, stack = set(), set()
+
+        def visit(node: str):
+            if node in stack:
+                raise ValueError(f"❌ [DAG] 순환 의존 발견: {node}")
+            if node in visited:
+                return
+            stack.add(node)
+            for dep in self._deps[node] + self._after[node]:
+                visit(dep)
+            stack.discard(node)
+            visited.add(node)
+
+        for name in self._nodes:
+            visit(name)
+
+    def _run_node(self, node: NodeResult):
+        node.started_at = time.perf_counter()
+        logger.info(f"[DAG] ▶ {node.name} 시작")
+        try:
+            node.result = self._nodes[node.name]()
+            node.status = "SUCCESS"
+        except Exception as e:
+            node.error = e
+            node.status = "FAILED"
+            logger.warning(f"[DAG] ❌ {node.name} 실패: {e}")
+        finally:
+            node.elapsed = time.perf_counter() - node.started_at
+            logger.info(f"[DAG] ■ {node.name} 종료 ({node.status}, {node.elapsed:.2f}s)")
+        return node
+
+    def run(self) -> Dict[str, NodeResult]:
+        self._validate()
+        results = {name: NodeResult(name) for name in self._nodes}
+        remaining = {name: set(self._deps[name]) | set(self._after[name]) for name in self._nodes}
+        running = {}
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="dag") as pool:
+            while remaining or running:
+                # 실행 가능한 노드 제출 (의존 노드가 모두 끝난 노드)
+                for name in [n for n, deps in remaining.items() if not deps]:
+                    del remaining[name]
+                    failed_deps = [d for d in self._deps[name] if results[d].status != "SUCCESS"]
+                    if failed_deps:
+                        # 실패 격리: 의존 노드가 실패하면 하위 노드만 건너뛴다
+                        results[name].status = "SKIPPED"
+                        logger.warning(f"[DAG] ⏭ {name} 건너뜀 (실패한 의존 노드: {failed_deps})")
+                        self._complete(name, remaining)
+                        continue
+                    running[pool.submit(self._run_node, results[name])] = name
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    self._complete(name, remaining)
+
+        total = time.perf_counter() - started
+        summary = ", ".join(f"{r.name}={r.status}({r.elapsed:.1f}s)" for r in results.values())
+        logger.info(f"[DAG] 전체 실행 완료 {total:.2f}s : {summary}")
+        return results
+
+    @staticmethod
+    def _complete(name: str, remaining: Dict[str, set]):
+        for deps in remaining.values():
+            deps.discard(name)
@@ -5,8 +5,12 @@ import os
 from dotenv import load_dotenv
 from datetime import date
 from crawling.services import CGVCrawler, MEGABOXCrawler, LOTTECrawler, KOFICCrawler, KOPISCrawler
-from infra.es_utils import save_to_es, load_all_movies_into_cache
+from crawling.services.crawling_util import refresh_update_flag
+from infra.es_utils import save_to_es
+from infra.resources import warm_up
+from infra.snapshot_store import get_snapshot_store
 from infra.discord_notify import send_discord_message
+from jobs.dag import DagExecutor
 
 load_dotenv()
 
@@ -39,82 +43,118 @@ async def run_scheduler():
 
     megabox_config = {
         "url": os.getenv("MEGABOX_API_URL"),
-        "url_sub": os.getenv("MEGABOX_API_URL_SUB")
+        "url_sub": os.getenv("MEGABOX_API_URL_SUB"),
+        "list_api_url": os.getenv("MEGABOX_LIST_API_URL"),
+        "list_api_onair": os.getenv("MEGABOX_LIST_API_ONAIR")
     }
 
     cgv_config = {
         "url": os.getenv("CGV_API_URL"),
-        "url_sub": os.getenv("CGV_API_URL_SUB")
+        "url_sub": os.getenv("CGV_API_URL_SUB"),
+        "list_api_url": os.getenv("CGV_LIST_API_URL")
     }
 
     lotte_config = {
         "url": os.getenv("LOTTE_API_URL"),
-        "url_sub": os.getenv("LOTTE_API_URL_SUB")
+        "url_sub": os.getenv("LOTTE_API_URL_SUB"),
+        "list_api_url": os.getenv("LOTTE_LIST_API_URL"),
+        "list_api_method": os.getenv("LOTTE_LIST_API_METHOD")
     }
 
-    try:
-        kopis = KOPISCrawler(kopis_config)
-        result = kopis.crawl()
-        print("📦 KOPIS 결과 총 수량", len(result))
-        save_to_es("kopis-index", result)
-        send_discord_message(f"✅ KOPIS 크롤링 완료! 수량: {len(result)}개")
-
-    except Exception as e:
-        print("❌ KOPIS 실패:", e)
-        send_discord_message(f"✅ KOPIS 크롤링 실패! {str(e)}")
-
-    try:
-        kofic = KOFICCrawler(kofic_config)
-        result = kofic.crawl()
-        print("📦 KOFIC 결과 총 수량", len(result))
-        save_to_es("kofic-index", result)
-        send_discord_message(f"✅ KOFIC 크롤링 완료! 수량: {len(result)}개")
-
-    except Exception as e:
-        print("❌ KOFIC 실패:", e)
-        send_discord_message(f"✅ KOFIC 크롤링 실패! {str(e)}")
-
-    load_all_movies_into_cache()
-    try:
-        megabox = MEGABOXCrawler(megabox_config)
-        result = megabox.crawl()
-        print("📦 MEGABOX 결과 총 수량", len(result))
-        print(result)
-        send_discord_message(f"✅ MEGABOX 크롤링 완료! 수량: {len(result)}개")
-
-        save_to_es("movie-index", result)
-    except Exception as e:
-        print("❌ MEGABOX 실패:", e)
-        send_discord_message(f"✅ MEGABOX 크롤링 실패! {str(e)}")
-
-    load_all_movies_into_cache()
-    try:
-        cgv = CGVCrawler(cgv_config)
-        result = cgv.crawl()
-        print("📦 CGV 결과 총 수량", len(result))
-        print(result)
-
-        save_to_es("movie-index", result)
-        send_discord_message(f"✅ CGV 크롤링 완료! 수량: {len(result)}개")
-
-    except Exception as e:
-        print("❌ CGV 실패:", e)
-        send_discord_message(f"✅ CGV 크롤링 실패! {str(e)}")
-
-
-    load_all_movies_into_cache()
-    try:
-        lotte = LOTTECrawler(lotte_config)
-        result = lotte.crawl()
-        print("📦 LOTTE 결과 총 수량", len(result))
-        print(result)
-
-        save_to_es("movie-index", result)
-        send_discord_message(f"✅ LOTTE 크롤링 완료! 수량: {len(result)}개")
-
-    except Exception as e:
-        print("❌ LOTTE 실패:", e)
-        send_discord_message(f"✅ LOTTE 크롤링 실패! {str(e)}")
+    ## 노드 정의
+    def run_kopis():
+        try:
+            # 실행 시점에 필요한 캐시만 새로 적재
+            warm_up(KOPISCrawler.resources)
+            kopis = KOPISCrawler(kopis_config)
+            result = kopis.crawl()
+            print("📦 KOPIS 결과 총 수량", len(result))
+            save_to_es("kopis-index", result)
+            send_discord_message(f"✅ KOPIS 크롤링 완료! 수량: {len(result)}개")
+
+        except Exception as e:
+            print("❌ KOPIS 실패:", e)
+            send_discord_message(f"❌ KOPIS 크롤링 실패! {str(e)}")
+            # DAG 실행기가 실패로 기록하도록 다시 발생
+            raise
+
+    def run_kofic():
+        try:
+            warm_up(KOFICCrawler.resources)
+            kofic = KOFICCrawler(kofic_config)
+            result = kofic.crawl()
+            print("📦 KOFIC 결과 총 수량", len(result))
+            save_to_es("kofic-index", result)
+            send_discord_message(f"✅ KOFIC 크롤링 완료! 수량: {len(result)}개")
+
+        except Exception as e:
+            print("❌ KOFIC 실패:", e)
+            send_discord_message(f"❌ KOFIC 크롤링 실패! {str(e)}")
+            # 극장 크롤러는 순서만 KOFIC 뒤이므로, 실패하더라도 기존 KOFIC 캐시로 실행
+            raise
+
+        # 극장 크롤러가 사용할 KOFIC / 영화 캐시 갱신
+        warm_up(["kofic", "movies"])
+
+    theater_results = {}
+    theater_listings = {}
+
+    def crawl_theater(name: str, crawler_cls, config: dict):
+        def run():
+            try:
+                crawler = crawler_cls(config)
+                result = crawler.crawl()
+                print(f"📦 {name} 결과 총 수량", len(result))
+                print(result)
+                theater_results[name] = result
+                theater_listings[name] = crawler.fetched_listings
+
+            except Exception as e:
+                print(f"❌ {name} 실패:", e)
+                send_discord_message(f"❌ {name} 크롤링 실패! {str(e)}")
+                raise
+        return run
+
+    # 극장 크롤링은 병렬로, movie-index 저장은 reservationLink 병합을 위해 순서대로 진행
+    def save_theater(name: str):
+        def run():
+            result = theater_results[name]
+            try:
+                warm_up(["movies"])
+                for dto in result:
+                    refresh_update_flag(dto)
+
+                # 직전 실행과 비교하여 실제로 바뀐 문서만 저장
+                # 저장에 실패한 문서가 있으면 스냅샷 / 목록 fingerprint 를 남기지 않아 다음 실행에서 다시 조회
+                store = get_snapshot_store()
+                delta = store.diff(name, result)
+                _, failed = save_to_es("movie-index", delta.changed_docs)
+                if not failed:
+                    store.commit(delta, listings=theater_listings.get(name, []))
+                send_discord_message(f"✅ {name} 크롤링 완료! 수량: {len(result)}개 (변경 {len(delta.changed_docs)}개)")
+
+            except Exception as e:
+                print(f"❌ {name} 실패:", e)
+                send_discord_message(f"❌ {name} 크롤링 실패! {str(e)}")
+                raise
+        return run
+
+    max_workers = int(os.getenv("SCHEDULER_MAX_WORKERS", "4"))
+    dag = DagExecutor(max_workers=max_workers)
+    dag.add("KOPIS", run_kopis)
+    dag.add("KOFIC", run_kofic)
+
+    prev_save = None
+    for name, crawler_cls, config in (("MEGABOX", MEGABOXCrawler, megabox_config),
+                                      ("CGV", CGVCrawler, cgv_config),
+                                      ("LOTTE", LOTTECrawler, lotte_config)):
+        # KOFIC 갱신 뒤에 실행하되, KOFIC 이 실패해도 기존 캐시로 크롤링 진행
+        dag.add(f"{name}_CRAWL", crawl_theater(name, crawler_cls, config), after=["KOFIC"])
+        # 이전 사이트 저장은 순서만 맞추고, 실패하더라도 이 사이트 저장은 진행
+        dag.add(f"{name}_SAVE", save_theater(name), deps=[f"{name}_CRAWL"], after=[prev_save] if prev_save else [])
+        prev_save = f"{name}_SAVE"
+
+    await asyncio.to_thread(dag.run)
 
 async def main():
     scheduler = AsyncIOScheduler()
@@ -1,7 +1,8 @@
 import asyncio
 
-from jobs.scheduler import main as scheduler_main
-
 if __name__ == "__main__":
+    # 파싱 worker(spawn) 가 main 을 다시 import 할 때 스케줄러 전체를 로딩하지 않도록 실행 시점에 import
+    from jobs.scheduler import main as scheduler_main
+
     print("🔍 [MAIN] 스케줄러 실행됨")
     asyncio.run(scheduler_main())
@@ -0,0 +1,12 @@
+from pathlib import Path
+
+import pytest
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+## tests/fixtures 아래 파일을 bytes 로 읽는 helper
+@pytest.fixture
+def load_fixture():
+    def load(name: str) -> bytes:
+        return (FIXTURES / name).read_bytes()
+    return load
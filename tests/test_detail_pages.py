@@ -0,0 +1,23 @@
+import pytest
+
+from crawling.base.html_parsing import DetailPage, parse_listing
+
+# 예시 페이지(tests/fixtures/*_detail.html)는 실제 응답이 아니라 사이트별 구조를 본떠 직접 작성한 것으로,
+# 비교하기 쉽도록 세 사이트 모두 같은 영화(파묘)의 정보를 담는다
+PLOT = "미국 LA, 거액의 의뢰를 받은 무당 '화림'과 '봉길'은 기이한 병이 대물림되는 집안의 장손을 만난다."
+
+## 예시 상세 페이지에서 사이트별 정보 영역(class 가 여러 개인 요소 포함)을 찾는지 확인
+@pytest.mark.parametrize("site, name", [("CGV", "div"), ("MEGABOX", "div"), ("LOTTE", "ul")])
+def test_detail_scope_finds_info_block(site, name, load_fixture):
+    page = DetailPage(load_fixture(f"{site.lower()}_detail.html"), site)
+    assert page.block is not None
+    assert page.block.name == name
+    assert page.description == PLOT
+
+def test_listing_scope_keeps_multi_class_items():
+    markup = (
+        '<div class="mm_list_item type2"><strong class="tit">A</strong></div>'
+        '<div class="screen_add_box on"><strong class="tit_info">B</strong></div>'
+    )
+    assert len(parse_listing(markup, "CGV").select("div.mm_list_item")) == 1
+    assert len(parse_listing(markup, "LOTTE").select(".screen_add_box")) == 1
@@ -0,0 +1,34 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from crawling.base.extraction_spec import detail_extractor
+from crawling.base.html_parsing import DetailPage
+
+ACTORS = ["최민식", "김고은", "유해진", "이도현"]
+
+# 사이트별 예시 상세 페이지(직접 작성한 구조 샘플)의 기대 추출 결과 (기존 사이트별 추출 함수와 같은 결과)
+EXPECTED = {
+    "CGV": {"directors": ["장재현"], "actors": ACTORS, "genres": ["미스터리"], "runningTime": 134},
+    "MEGABOX": {"directors": ["장재현"], "actors": ACTORS, "genres": ["미스터리", "스릴러"], "runningTime": 134},
+    "LOTTE": {"directors": ["장재현"], "actors": ACTORS, "genres": ["미스터리", "스릴러"], "runningTime": 134}
+}
+
+@pytest.mark.parametrize("site", list(EXPECTED))
+def test_spec_matches_sample_page(site, load_fixture):
+    page = DetailPage(load_fixture(f"{site.lower()}_detail.html"), site)
+    assert detail_extractor(site).extract(page.block) == EXPECTED[site]
+
+@pytest.mark.parametrize("site", list(EXPECTED))
+def test_missing_block_uses_defaults(site):
+    fields = detail_extractor(site).extract(None)
+    assert fields == {"directors": [], "actors": [], "genres": ["기타"], "runningTime": 0}
+
+# CGV 상영시간은 기존 extract_runtime 과 같이 "기본 정보" dt 와 같은 순번의 dd 에서 읽음 (dt 바로 뒤 dd 가 아님)
+def test_cgv_runtime_pairs_dt_and_dd_by_index():
+    block = BeautifulSoup(
+        "<div class='spec'><dl>"
+        "<dt>감독 : </dt><dd>A</dd><dd>B</dd>"
+        "<dt>기본 정보 : </dt><dd>15세이상관람가, 120분</dd>"
+        "</dl></div>", "html.parser"
+    ).div
+    assert detail_extractor("CGV").extract(block)["runningTime"] == 0
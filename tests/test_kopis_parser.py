@@ -0,0 +1,38 @@
+import pytest
+import xmltodict
+
+from crawling.services.kopis_parser import parse_detail, parse_list
+
+# 기존 xmltodict 경로의 목록 결과 (단일 db 는 dict 로 오므로 리스트로 감싼다)
+def legacy_list(source: bytes) -> list:
+    db_list = (xmltodict.parse(source).get("dbs", {}) or {}).get("db", [])
+    return [db_list] if isinstance(db_list, dict) else db_list
+
+# 기존 create_dto 가 xmltodict 상세 결과에서 relates / styurls 를 꺼내던 방식
+def legacy_detail(source: bytes) -> dict:
+    detail = dict(xmltodict.parse(source).get("dbs", {}).get("db", {}))
+
+    relate_data = (detail.pop("relates", None) or {}).get("relate")
+    relate_data = [relate_data] if isinstance(relate_data, dict) else relate_data or []
+    styurl_node = (detail.pop("styurls", None) or {}).get("styurl")
+    styurl_node = [styurl_node] if isinstance(styurl_node, str) else styurl_node or []
+
+    # 공백뿐인 요소는 xmltodict 에서 None, iterparse 경로에서는 "" (사용처는 둘 다 빈 값으로 처리)
+    record = {key: (value or "").strip() for key, value in detail.items()}
+    record["relates"] = [(r.get("relatenm"), r.get("relateurl")) for r in relate_data]
+    record["styurls"] = [url.strip() for url in styurl_node if isinstance(url, str) and url.strip()]
+    return record
+
+def test_list_matches_xmltodict(load_fixture):
+    source = load_fixture("kopis_list.xml")
+    assert parse_list(source) == legacy_list(source)
+
+@pytest.mark.parametrize("name", ["kopis_detail.xml", "kopis_detail_single.xml"])
+def test_detail_matches_xmltodict(name, load_fixture):
+    source = load_fixture(name)
+    assert parse_detail(source) == legacy_detail(source)
+
+def test_single_relate_and_styurl_are_lists(load_fixture):
+    detail = parse_detail(load_fixture("kopis_detail_single.xml"))
+    assert detail["relates"] == [("NHN티켓링크", "http://www.ticketlink.co.kr/product/53104")]
+    assert len(detail["styurls"]) == 1